@@ -25,6 +25,20 @@ if config.config_file_name is not None:
 # Cible des métadonnées pour l’autogénération
 target_metadata = Base.metadata
 
+# Objets gérés uniquement par les migrations (colonne générée tsvector et
+# index GIN de recherche et de trigrammes, propres à PostgreSQL) :
+# l'autogénération doit les ignorer.
+UNMAPPED = {
+    ("column", "search_vector"),
+    ("index", "ix_tasks_search"),
+    ("index", "ix_users_username_trgm"),
+    ("index", "ix_users_email_trgm"),
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return (type_, name) not in UNMAPPED
+
 
 # ---------------------------------------------------------------------------
 # FONCTIONS ALEMBIC
@@ -40,6 +54,7 @@ def run_migrations_offline():
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,  # détecte changements de type
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -63,6 +78,7 @@ def run_migrations_online():
             target_metadata=target_metadata,
             compare_type=True,  # détecte changements de colonnes
             compare_server_default=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
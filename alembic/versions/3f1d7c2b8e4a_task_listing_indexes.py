@@ -0,0 +1,34 @@
+"""task listing indexes
+
+Revision ID: 3f1d7c2b8e4a
+Revises: 9a5b30c1ca2c
+Create Date: 2026-10-18 09:12:40.512374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1d7c2b8e4a'
+down_revision: Union[str, Sequence[str], None] = '9a5b30c1ca2c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_group_created', 'tasks', ['group_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_group_status_created', 'tasks', ['group_id', 'status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_group_creator_created', 'tasks', ['group_id', 'creator_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_group_deadline', 'tasks', ['group_id', 'deadline'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_group_deadline', table_name='tasks')
+    op.drop_index('ix_tasks_group_creator_created', table_name='tasks')
+    op.drop_index('ix_tasks_group_status_created', table_name='tasks')
+    op.drop_index('ix_tasks_group_created', table_name='tasks')
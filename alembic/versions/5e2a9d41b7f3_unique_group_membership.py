@@ -0,0 +1,33 @@
+"""unique group membership
+
+Revision ID: 5e2a9d41b7f3
+Revises: c84e19a05d6b
+Create Date: 2026-10-18 16:02:41.508317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a9d41b7f3'
+down_revision: Union[str, Sequence[str], None] = 'c84e19a05d6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # keep the oldest row of any duplicated membership
+    op.execute(
+        "DELETE FROM group_members WHERE id NOT IN ("
+        "SELECT MIN(id) FROM group_members GROUP BY group_id, user_id)"
+    )
+    op.create_index('uq_group_members_group_user', 'group_members', ['group_id', 'user_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_group_members_group_user', table_name='group_members')
@@ -0,0 +1,41 @@
+"""task search vector
+
+Revision ID: 8b7c4e0f2a19
+Revises: 5e2a9d41b7f3
+Create Date: 2026-10-18 17:20:13.664102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b7c4e0f2a19'
+down_revision: Union[str, Sequence[str], None] = '5e2a9d41b7f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PostgreSQL only: other databases fall back to LIKE matching
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # must stay in sync with SEARCH_CONFIG in app/routers/tasks.py
+    op.execute(
+        "ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('french', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('french', coalesce(description, '')), 'B')"
+        ") STORED"
+    )
+    op.create_index('ix_tasks_search', 'tasks', ['search_vector'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_tasks_search', table_name='tasks')
+    op.drop_column('tasks', 'search_vector')
@@ -0,0 +1,40 @@
+"""user directory indexes
+
+Revision ID: b5d0e3f7c912
+Revises: 4c8e1a7b9d25
+Create Date: 2026-10-18 21:48:31.907254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d0e3f7c912'
+down_revision: Union[str, Sequence[str], None] = '4c8e1a7b9d25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_group_members_user_group', 'group_members', ['user_id', 'group_id'], unique=False)
+    op.create_index('ix_users_username_lower_id', 'users', [sa.text('lower(username)'), 'id'], unique=False)
+    # PostgreSQL: trigram indexes serve the typeahead's LIKE 'prefix%' on
+    # lower(username) / lower(email) whatever the collation
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_users_username_trgm', 'users', [sa.text('lower(username) gin_trgm_ops')], postgresql_using='gin')
+    op.create_index('ix_users_email_trgm', 'users', [sa.text('lower(email) gin_trgm_ops')], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_users_email_trgm', table_name='users')
+        op.drop_index('ix_users_username_trgm', table_name='users')
+    op.drop_index('ix_users_username_lower_id', table_name='users')
+    op.drop_index('ix_group_members_user_group', table_name='group_members')
@@ -0,0 +1,28 @@
+"""group version
+
+Revision ID: c84e19a05d6b
+Revises: 3f1d7c2b8e4a
+Create Date: 2026-10-18 14:37:05.190822
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c84e19a05d6b'
+down_revision: Union[str, Sequence[str], None] = '3f1d7c2b8e4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('groups', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('groups', 'version')
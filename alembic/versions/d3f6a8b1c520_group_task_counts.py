@@ -0,0 +1,43 @@
+"""group task counts
+
+Revision ID: d3f6a8b1c520
+Revises: 8b7c4e0f2a19
+Create Date: 2026-10-18 18:04:52.317840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f6a8b1c520'
+down_revision: Union[str, Sequence[str], None] = '8b7c4e0f2a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('group_task_counts',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('creator_id', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['creator_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ),
+    sa.PrimaryKeyConstraint('group_id', 'status', 'creator_id')
+    )
+    # backfill; `python -m app.cli rebuild-stats` does the same later on
+    op.execute(
+        "INSERT INTO group_task_counts (group_id, status, creator_id, count) "
+        "SELECT group_id, coalesce(status, ''), creator_id, count(*) FROM tasks "
+        "WHERE group_id IS NOT NULL AND creator_id IS NOT NULL "
+        "GROUP BY group_id, coalesce(status, ''), creator_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('group_task_counts')
@@ -0,0 +1,51 @@
+"""tasks archive
+
+Revision ID: e7b2c94d1f36
+Revises: a1c93e7d5f08
+Create Date: 2026-10-18 20:12:44.508193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2c94d1f36'
+down_revision: Union[str, Sequence[str], None] = 'a1c93e7d5f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tasks_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('deadline', sa.DateTime(), nullable=True),
+    sa.Column('creator_id', sa.Integer(), nullable=True),
+    sa.Column('group_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['creator_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tasks_archive_group_created', 'tasks_archive', ['group_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_status_updated', 'tasks', ['status', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_status_updated', table_name='tasks')
+    # archived tasks go back to the live table rather than being lost
+    op.execute(
+        "INSERT INTO tasks (id, title, description, status, deadline, creator_id, group_id, created_at, updated_at) "
+        "SELECT id, title, description, status, deadline, creator_id, group_id, created_at, updated_at FROM tasks_archive"
+    )
+    op.drop_index('ix_tasks_archive_group_created', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
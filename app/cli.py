@@ -0,0 +1,161 @@
+# app/cli.py
+"""Server and maintenance commands: ``python -m app.cli <command> --help``.
+
+Imports happen inside the commands, so each one only loads what it uses.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from app.core.config import settings
+
+
+def rebuild_stats(args):
+    from app.core import stats
+    from app.database import SessionLocal
+
+    with SessionLocal() as db:
+        rows = stats.rebuild(db, args.group or None)
+        db.commit()
+    print(f"rebuilt {rows} counter rows")
+
+
+def build_static(args):
+    from app.core.static import build
+
+    manifest = build(args.src, args.out)
+    print(f"built {len(manifest)} assets into {args.out}")
+
+
+def archive_tasks(args):
+    from app.core.archive import archive_done_tasks
+    from app.database import SessionLocal
+
+    with SessionLocal() as db:
+        moved = archive_done_tasks(db, args.days, args.batch)
+    print(f"archived {moved} tasks")
+
+
+def worker(args):
+    from app.core.jobs import worker_loop
+
+    asyncio.run(worker_loop())
+
+
+def enqueue(args):
+    from app.core.jobs import enqueue as enqueue_job, load_handlers, HANDLERS
+    from app.database import SessionLocal
+
+    load_handlers()
+    if args.kind not in HANDLERS:
+        raise SystemExit(f"unknown job {args.kind!r}; known: {', '.join(sorted(HANDLERS))}")
+    with SessionLocal() as db:
+        queued = enqueue_job(db, args.kind, **json.loads(args.payload))
+        db.commit()
+        print(f"queued job {queued.id}")
+
+
+def run_jobs(args):
+    from app.core.jobs import load_handlers, run_pending
+
+    load_handlers()
+    print(f"ran {run_pending()} jobs")
+
+
+def import_users(args):
+    from app.core.importer import Importer, read_records
+    from app.database import SessionLocal
+
+    def progress(report):
+        print(f"  {report.records} records, {report.rate:.0f} rows/s", file=sys.stderr)
+
+    group_map = {}
+    if args.group_map and os.path.exists(args.group_map):
+        with open(args.group_map) as f:
+            group_map = json.load(f)
+    importer = Importer(
+        SessionLocal, args.batch, args.workers, args.rounds,
+        use_copy=False if args.no_copy else None, group_map=group_map,
+    )
+    try:
+        report = importer.run(read_records(args.file, args.format), progress)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    if args.group_map and report.groups_created:
+        with open(args.group_map, "w") as f:
+            json.dump(report.group_map, f, indent=2, ensure_ascii=False)
+    for error in report.errors[:args.show_errors]:
+        print(f"  skipped {error}", file=sys.stderr)
+    print(
+        f"imported {report.records} records in {report.elapsed:.1f}s ({report.rate:.0f} rows/s): "
+        f"{report.users_created} users created, {report.users_existing} already present, "
+        f"{report.groups_created} groups created, {report.memberships_added} memberships added, "
+        f"{report.skipped} skipped; waited {report.hash_wait:.1f}s on password hashing"
+    )
+
+
+def serve(args):
+    from app.core.server import serve as run_server
+
+    run_server(args.host, args.port, args.workers, args.server)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cmd = commands.add_parser("serve", help="run the app with several worker processes")
+    cmd.add_argument("--host", default=None, help=f"default {settings.SERVER_HOST}")
+    cmd.add_argument("--port", type=int, default=None, help=f"default {settings.SERVER_PORT}")
+    cmd.add_argument("--workers", type=int, default=0, help="default SERVER_WORKERS, or one per CPU")
+    cmd.add_argument("--server", choices=("auto", "gunicorn", "uvicorn"), default="auto",
+                     help="auto: gunicorn (preloaded app) when installed, else uvicorn")
+    cmd.set_defaults(func=serve)
+
+    cmd = commands.add_parser("rebuild-stats", help="recompute group task counters from the tasks table")
+    cmd.add_argument("--group", type=int, action="append", help="only this group (repeatable)")
+    cmd.set_defaults(func=rebuild_stats)
+
+    cmd = commands.add_parser("archive-tasks", help="move done tasks older than --days to tasks_archive")
+    cmd.add_argument("--days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    cmd.add_argument("--batch", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    cmd.set_defaults(func=archive_tasks)
+
+    cmd = commands.add_parser("worker", help="run a background job worker")
+    cmd.set_defaults(func=worker)
+
+    cmd = commands.add_parser("enqueue", help="queue a background job")
+    cmd.add_argument("kind", help="e.g. stats.rebuild")
+    cmd.add_argument("--payload", default="{}", help="JSON object of handler arguments")
+    cmd.set_defaults(func=enqueue)
+
+    cmd = commands.add_parser("run-jobs", help="run every due job once, in this process")
+    cmd.set_defaults(func=run_jobs)
+
+    cmd = commands.add_parser("import-users", help="import users, groups and memberships from CSV or JSONL")
+    cmd.add_argument("file")
+    cmd.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    cmd.add_argument("--batch", type=int, default=5000, help="records per transaction")
+    cmd.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                     help="password hashing processes (0: hash in this process)")
+    cmd.add_argument("--rounds", type=int, default=settings.BCRYPT_ROUNDS,
+                     help="bcrypt cost; hashes of another cost are upgraded at the next login")
+    cmd.add_argument("--no-copy", action="store_true", help="multi-row INSERTs even on PostgreSQL")
+    cmd.add_argument("--group-map", metavar="JSON_FILE",
+                     help="group name -> existing group id; the groups created are added to it")
+    cmd.add_argument("--show-errors", type=int, default=20, help="skipped records to list")
+    cmd.set_defaults(func=import_users)
+
+    cmd = commands.add_parser("build-static", help="hash, rewrite and precompress the frontend")
+    cmd.add_argument("--src", default=settings.FRONTEND_DIR)
+    cmd.add_argument("--out", default=settings.FRONTEND_BUILD_DIR)
+    cmd.set_defaults(func=build_static)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
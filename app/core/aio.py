@@ -0,0 +1,80 @@
+# app/core/aio.py
+"""Async mode: serve the routers on the event loop over an ``AsyncSession``.
+
+Handlers are written once, against a sync ``Session``. In async mode each sync
+handler is wrapped in an ``async def`` that runs it through
+``AsyncSession.run_sync``: SQLAlchemy executes the handler in a greenlet on
+the event loop and every statement goes through the async driver, so a request
+no longer holds a threadpool worker while it waits on the database.
+"""
+import functools
+import inspect
+
+from fastapi import APIRouter, FastAPI
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+from app.core.metrics import timed
+from app.core.security import get_current_user
+from app.database import get_async_db, get_async_read_db, get_db, get_read_db
+
+# sync dependencies that take a ``db`` session and must run in the greenlet too
+SESSION_DEPENDENCIES = [get_current_user]
+
+
+def run_in_session(fn, response_model=None):
+    """Wrap a sync ``fn(..., db)`` into a coroutine taking an ``AsyncSession`` as ``db``."""
+    adapter = TypeAdapter(response_model) if response_model is not None else None
+    validate = timed("serialize")(functools.partial(adapter.validate_python, from_attributes=True)) if adapter else None
+
+    def call(session, kwargs):
+        result = fn(**{**kwargs, "db": session})
+        # validate while still inside the greenlet, lazy loads need it
+        if adapter is not None and not isinstance(result, Response):
+            result = validate(result)
+        return result
+
+    @functools.wraps(fn)
+    async def wrapper(**kwargs):
+        return await kwargs["db"].run_sync(call, kwargs)
+
+    return wrapper
+
+
+def async_router(router: APIRouter) -> APIRouter:
+    """Copy of ``router`` whose sync, session-bound endpoints run via ``run_in_session``."""
+    aio_router = APIRouter()
+    for route in router.routes:
+        endpoint = route.endpoint
+        if not inspect.iscoroutinefunction(endpoint) and "db" in inspect.signature(endpoint).parameters:
+            endpoint = run_in_session(endpoint, route.response_model)
+        aio_router.add_api_route(
+            route.path,
+            endpoint,
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            deprecated=route.deprecated,
+            methods=route.methods,
+            operation_id=route.operation_id,
+            include_in_schema=route.include_in_schema,
+            response_class=route.response_class,
+            name=route.name,
+            openapi_extra=route.openapi_extra,
+            route_class_override=type(route),
+        )
+    return aio_router
+
+
+def install(app: FastAPI, routers: list[APIRouter]):
+    for router in routers:
+        app.include_router(async_router(router))
+    app.dependency_overrides[get_db] = get_async_db
+    app.dependency_overrides[get_read_db] = get_async_read_db
+    for dependency in SESSION_DEPENDENCIES:
+        app.dependency_overrides[dependency] = run_in_session(dependency)
@@ -0,0 +1,68 @@
+# app/core/archive.py
+"""Archival of finished tasks.
+
+``done`` tasks not updated for ``ARCHIVE_AFTER_DAYS`` move from ``tasks`` to
+``tasks_archive`` (same ids) in batches, one transaction each, so the hot
+table and its indexes only hold live work. Group counters are unaffected:
+they count archived tasks too. Listings and exports reach the archive with
+``include_archived``.
+
+Runs as the periodic ``tasks.archive`` job and on demand with
+``python -m app.cli archive-tasks``. Batches are claimed with
+``FOR UPDATE SKIP LOCKED``, so several runs can overlap safely.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import DateTime, delete, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.etag import bump_group_version
+from app.core.events import publish
+from app.core.jobs import job
+from app.models import ArchivedTask, Task
+
+COLUMNS = ("id", "title", "description", "status", "deadline", "creator_id", "group_id", "created_at", "updated_at")
+
+
+def archive_done_tasks(db: Session, older_than_days: int, batch_size: int) -> int:
+    """Move eligible tasks batch by batch; returns how many moved."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    moved = 0
+    while True:
+        rows = db.execute(
+            select(Task.id, Task.group_id)
+            .where(Task.status == "done", Task.updated_at < cutoff)
+            .order_by(Task.updated_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not rows:
+            break
+
+        ids = [row.id for row in rows]
+        now = literal(datetime.utcnow(), DateTime)
+        db.execute(insert(ArchivedTask).from_select(
+            [*COLUMNS, "archived_at"],
+            select(*(getattr(Task, c) for c in COLUMNS), now).where(Task.id.in_(ids)),
+        ))
+        db.execute(delete(Task).where(Task.id.in_(ids)), execution_options={"synchronize_session": False})
+
+        by_group = {}
+        for row in rows:
+            if row.group_id is not None:
+                by_group.setdefault(row.group_id, []).append(row.id)
+        for group_id, task_ids in by_group.items():
+            publish(db, group_id, "task.archived", {"ids": task_ids})
+        bump_group_version(db, *by_group)
+        db.commit()
+
+        moved += len(ids)
+        if len(rows) < batch_size:
+            break
+    return moved
+
+
+@job("tasks.archive", every=settings.ARCHIVE_INTERVAL_SECONDS)
+def archive_job(db: Session):
+    archive_done_tasks(db, settings.ARCHIVE_AFTER_DAYS, settings.ARCHIVE_BATCH_SIZE)
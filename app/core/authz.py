@@ -0,0 +1,83 @@
+# app/core/authz.py
+"""Group-scoped authorization.
+
+Resolves (user, group) -> role with one indexed query (batched for several
+groups) and keeps the answer in a bounded TTL cache. Handlers invalidate an
+entry after committing a join or removal; the same change events reach the
+other workers through the event hub (postgres backend), so their caches are
+dropped as well rather than waiting for the TTL.
+"""
+from fastapi import HTTPException
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.events import hub
+from app.models import Group, GroupMember
+
+OWNER, ADMIN, MEMBER = "owner", "admin", "member"
+MANAGERS = {OWNER, ADMIN}
+_NOT_MEMBER = object()  # cached negative answer
+
+
+class Authorizer:
+    def __init__(self, cache: TTLCache):
+        self.cache = cache
+
+    def roles(self, db: Session, user_id: int, group_ids) -> dict[int, str | None]:
+        """Role of ``user_id`` in each existing group (None if not a member).
+
+        Groups that do not exist are left out of the result.
+        """
+        result, missing = {}, set()
+        for group_id in {gid for gid in group_ids if gid is not None}:
+            cached = self.cache.get((user_id, group_id))
+            if cached is None:
+                missing.add(group_id)
+            else:
+                result[group_id] = None if cached is _NOT_MEMBER else cached
+
+        if missing:
+            rows = db.execute(
+                select(Group.id, Group.owner_id, GroupMember.role)
+                .outerjoin(GroupMember, and_(GroupMember.group_id == Group.id, GroupMember.user_id == user_id))
+                .where(Group.id.in_(missing))
+            )
+            for group_id, owner_id, role in rows:
+                if owner_id == user_id:
+                    role = OWNER
+                result[group_id] = role
+                self.cache.set((user_id, group_id), _NOT_MEMBER if role is None else role)
+        return result
+
+    def role(self, db: Session, user_id: int, group_id: int) -> str | None:
+        roles = self.roles(db, user_id, [group_id])
+        if group_id not in roles:
+            raise HTTPException(404, "Groupe introuvable")
+        return roles[group_id]
+
+    def require_member(self, db: Session, user_id: int, group_id: int) -> str:
+        role = self.role(db, user_id, group_id)
+        if role is None:
+            raise HTTPException(403, "Vous n'êtes pas membre de ce groupe")
+        return role
+
+    def require_manager(self, db: Session, user_id: int, group_id: int, detail: str) -> str:
+        role = self.role(db, user_id, group_id)
+        if role not in MANAGERS:
+            raise HTTPException(403, detail)
+        return role
+
+    def invalidate(self, group_id: int, user_id: int):
+        self.cache.pop((user_id, group_id))
+
+
+authorizer = Authorizer(TTLCache(settings.AUTHZ_CACHE_SIZE, settings.AUTHZ_CACHE_TTL_SECONDS))
+
+
+def _on_membership_event(message: dict):
+    if message["type"] in ("member.joined", "member.removed"):
+        authorizer.invalidate(message["group_id"], message["data"]["user_id"])
+
+hub.add_listener(_on_membership_event)
@@ -0,0 +1,55 @@
+# app/core/etag.py
+"""Conditional GET for group-scoped reads.
+
+Every group carries a ``version`` bumped by each mutation of the group, its
+members or its tasks. ETags are derived from that version, so answering
+``If-None-Match`` with a 304 costs a primary-key lookup on ``groups`` and
+never touches the task or member tables.
+"""
+import hashlib
+
+from fastapi import Request, Response
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models import Group
+
+
+def bump_group_version(db: Session, *group_ids):
+    """Invalidate the ETags of the given groups; part of the caller's transaction."""
+    ids = {gid for gid in group_ids if gid is not None}
+    if ids:
+        db.execute(
+            update(Group).where(Group.id.in_(ids)).values(version=Group.version + 1),
+            execution_options={"synchronize_session": False},
+        )
+
+
+def make_etag(*parts) -> str:
+    return 'W/"%s"' % hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+
+
+def group_etag(db: Session, group_id: int, *parts) -> str | None:
+    """ETag of a representation of ``group_id``; None when the group does not exist."""
+    version = db.query(Group.version).filter(Group.id == group_id).scalar()
+    if version is None:
+        return None
+    return make_etag(group_id, version, *parts)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # weak comparison: W/ prefixes are ignored
+    opaque = etag.removeprefix("W/")
+    return any(tag == "*" or tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def check_etag(request: Request, response: Response, etag: str | None) -> Response | None:
+    """Tag ``response``; return a 304 to send instead when the client copy is fresh."""
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
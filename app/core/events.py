@@ -0,0 +1,118 @@
+# app/core/events.py
+"""Per-group change feed.
+
+Handlers call ``publish(db, group_id, type, data)`` before committing. The
+events are only delivered once the transaction commits (and dropped on
+rollback):
+
+* ``memory`` backend: handed to the in-process hub after the commit.
+* ``postgres`` backend: sent with ``pg_notify`` inside the transaction, so
+  Postgres delivers them on commit to every worker running ``listen()``,
+  which feeds its own hub.
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EventHub:
+    """Fans events out to the subscribers of a group, from any thread."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set] = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """Call ``callback(message)`` synchronously for every dispatched event."""
+        self._listeners.append(callback)
+
+    def subscribe(self, group_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(group_id, set()).add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, group_id: int, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(group_id, set())
+            subscribers.difference_update({s for s in subscribers if s[1] is queue})
+            if not subscribers:
+                self._subscribers.pop(group_id, None)
+
+    def dispatch(self, message: dict):
+        for callback in self._listeners:
+            callback(message)
+        with self._lock:
+            subscribers = list(self._subscribers.get(message["group_id"], ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._offer, queue, message)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, message: dict):
+        if queue.full():
+            # slow client: drop its backlog and tell it to reload
+            while not queue.empty():
+                queue.get_nowait()
+            message = {"type": "resync", "group_id": message["group_id"]}
+        queue.put_nowait(message)
+
+
+hub = EventHub(settings.EVENTS_QUEUE_SIZE)
+
+
+def publish(db: Session, group_id: int | None, type: str, data: dict):
+    """Queue an event for ``group_id``; delivered when ``db`` commits."""
+    if group_id is None:
+        return
+    db.info.setdefault("pending_events", []).append({"type": type, "group_id": group_id, "data": data})
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_pending(session):
+    if settings.EVENTS_BACKEND != "postgres":
+        return
+    for message in session.info.get("pending_events", ()):
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": settings.EVENTS_CHANNEL, "payload": json.dumps(message, default=str)},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_pending(session):
+    pending = session.info.pop("pending_events", ())
+    if settings.EVENTS_BACKEND == "memory":
+        for message in pending:
+            hub.dispatch(message)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session):
+    session.info.pop("pending_events", None)
+
+
+async def listen():
+    """Relay NOTIFY messages to the local hub (postgres backend); runs until cancelled."""
+    import psycopg
+
+    dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+                await conn.execute(f'LISTEN "{settings.EVENTS_CHANNEL}"')
+                async for notify in conn.notifies():
+                    hub.dispatch(json.loads(notify.payload))
+        except psycopg.OperationalError:
+            logger.exception("event listener lost its connection, reconnecting")
+            await asyncio.sleep(1)
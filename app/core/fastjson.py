@@ -0,0 +1,35 @@
+# app/core/fastjson.py
+"""Bulk JSON rendering for the hot list endpoints.
+
+With ``FAST_JSON`` on, those endpoints select plain column tuples, build the
+response dicts themselves (matching their ``response_model``, which is kept
+for the OpenAPI schema) and return a ``FastJSONResponse``: FastAPI then skips
+the per-object validation and serializes nothing itself. Rendering uses
+orjson when it is installed, pydantic-core's serializer otherwise; both emit
+the same ISO dates as the regular path.
+"""
+from pydantic_core import to_json
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return to_json(content)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def fast_response(content, response: Response | None = None) -> FastJSONResponse:
+    """Render ``content``, keeping headers (ETag...) already set on the injected ``response``."""
+    return FastJSONResponse(content, headers=response.headers if response is not None else None)
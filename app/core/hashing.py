@@ -0,0 +1,64 @@
+# app/core/hashing.py
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.passwords import bcrypt_cost, bcrypt_hash, bcrypt_verify, lower_priority
+
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop, in a dedicated process pool.
+
+    At most ``workers`` hashes run at once and ``queue`` more may wait; past
+    that, callers get a 429 instead of piling up behind a login storm.
+    """
+
+    def __init__(self, workers: int, queue: int, rounds: int):
+        self.workers = workers
+        self.queue = queue
+        self.rounds = rounds
+        self._pool = None
+        self._pending = 0
+
+    def _executor(self):
+        if self._pool is None and self.workers > 0:
+            # spawn: forking a process that already runs threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=lower_priority,
+            )
+        return self._pool
+
+    async def _run(self, fn, *args):
+        if self._pending >= max(self.workers, 1) + self.queue:
+            raise HTTPException(429, "Trop de requêtes d'authentification, réessayez", headers={"Retry-After": "1"})
+        self._pending += 1
+        try:
+            executor = self._executor()
+            if executor is None:
+                return await run_in_threadpool(fn, *args)
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(bcrypt_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(bcrypt_verify, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return bcrypt_cost(hashed) != self.rounds
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE, settings.BCRYPT_ROUNDS)
@@ -0,0 +1,313 @@
+# app/core/importer.py
+"""Bulk onboarding: users, groups and memberships from a CSV or JSONL file.
+
+Each record is a user, optionally joining a group::
+
+    email,username,password,group,role
+    ana@example.com,ana,s3cret,Compta,admin
+    bob@example.com,bob,hunter2,Compta,
+    ana@example.com,,,Direction,member
+
+JSONL lines carry the same keys. A user listed again only adds memberships.
+``hashed_password`` may replace ``password`` with an existing bcrypt hash
+(migration from another system); ``username`` defaults to the local part of
+the email. Group names are local to the file: they are never looked up
+among existing groups (names are not unique across customers). A name given
+in the group map (name -> id of an existing group) joins that group; any
+other name gets a new group, created once per import and owned by the first
+record making someone its ``admin`` (else its first member). The groups
+created are added to the map, so re-running with the same map reuses them.
+
+The import is idempotent: users are upserted on email (an existing account
+is kept as it is, its password never re-hashed) and memberships already
+present are left alone. Records go in batches of one transaction each:
+
+* passwords are hashed across a process pool, the next batch's hashes
+  running while the current batch is written;
+* on PostgreSQL, users and memberships are loaded with ``COPY`` into a
+  temporary table, then upserted from it in one statement; elsewhere with
+  multi-row ``INSERT ... ON CONFLICT``.
+
+Run with ``python -m app.cli import-users FILE``.
+"""
+import contextlib
+import csv
+import io
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice, repeat
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.etag import bump_group_version
+from app.core.passwords import bcrypt_hash
+from app.database import dialect_insert
+from app.models import Group, GroupMember, User
+
+ROLES = ("admin", "member")
+INSERT_CHUNK = 500  # rows per multi-row INSERT (SQLite caps bound parameters)
+
+
+@dataclass
+class ImportReport:
+    records: int = 0
+    users_created: int = 0
+    users_existing: int = 0
+    groups_created: int = 0
+    group_map: dict[str, int] = field(default_factory=dict)  # given plus created
+    memberships_added: int = 0
+    skipped: int = 0
+    hash_wait: float = 0.0  # time the writes spent waiting on bcrypt
+    elapsed: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def rate(self) -> float:
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class _Batch:
+    users: dict[str, str]  # email -> username, every user of the batch
+    new: dict[str, str | None]  # email -> given hash, users to create
+    to_hash: list[str]  # emails of ``new`` whose password gets hashed here
+    hashes: object  # iterator of their hashes, in order
+    memberships: list[tuple[str, str, str]]  # (email, group name, role)
+    records: int
+
+
+def read_records(path: str, fmt: str | None = None):
+    """(line number, record) for each record of a CSV or JSONL file; records
+    that cannot be parsed come back as None."""
+    fmt = fmt or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+            return
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield number, record if isinstance(record, dict) else None
+
+
+def _clean(record: dict | None) -> tuple:
+    if record is None:
+        raise ValueError("unreadable record")
+    email = (record.get("email") or "").strip()
+    if "@" not in email:
+        raise ValueError("missing or invalid email")
+    username = (record.get("username") or "").strip() or email.split("@")[0]
+    role = (record.get("role") or "").strip() or "member"
+    if role not in ROLES:
+        raise ValueError(f"unknown role {role!r}")
+    group = (record.get("group") or "").strip() or None
+    return email, username, record.get("password") or None, record.get("hashed_password") or None, group, role
+
+
+def _batched(iterable, size: int):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Importer:
+    def __init__(
+        self, session_factory, batch_size: int, workers: int, rounds: int,
+        use_copy: bool | None = None, group_map: dict[str, int] | None = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.workers = workers
+        self.rounds = rounds
+        self.use_copy = use_copy
+        self._seen: set[str] = set()  # emails handled by earlier batches
+        self._groups: dict[str, int] = dict(group_map or {})  # group name -> id
+
+    def run(self, records, progress=None) -> ImportReport:
+        report = ImportReport(group_map=self._groups)
+        start = time.perf_counter()
+        pool = (
+            ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            if self.workers > 0 else None
+        )
+        with pool or contextlib.nullcontext(), self.session_factory() as db:
+            if self.use_copy is None:
+                self.use_copy = db.get_bind().dialect.name == "postgresql"
+            unknown = set(self._groups.values()) - set(
+                db.scalars(select(Group.id).where(Group.id.in_(list(self._groups.values()))))
+            )
+            if unknown:
+                raise ValueError(f"group map refers to missing groups: {sorted(unknown)}")
+            db.rollback()
+            pending = None
+            for batch in _batched(records, self.batch_size):
+                # hash this batch in the pool while the previous one is written
+                prepared = self._prepare(db, batch, pool, report)
+                if pending is not None:
+                    self._write(db, pending, report, start, progress)
+                pending = prepared
+            if pending is not None:
+                self._write(db, pending, report, start, progress)
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _prepare(self, db: Session, batch, pool, report: ImportReport) -> _Batch:
+        users, given, passwords, memberships = {}, {}, {}, []
+        for number, record in batch:
+            try:
+                email, username, password, hashed, group, role = _clean(record)
+            except ValueError as exc:
+                report.skipped += 1
+                report.errors.append(f"line {number}: {exc}")
+                continue
+            if email not in users:
+                users[email] = username
+                given[email], passwords[email] = hashed, (password, number)
+            if group is not None:
+                memberships.append((email, group, role))
+
+        existing = set(db.scalars(select(User.email).where(User.email.in_(list(users))))) if users else set()
+        new = {}
+        for email in users:
+            if email in self._seen:
+                continue
+            if email in existing:
+                report.users_existing += 1
+            elif given[email] is None and passwords[email][0] is None:
+                report.skipped += 1
+                report.errors.append(f"line {passwords[email][1]}: password required for a new user")
+            else:
+                new[email] = given[email]
+        dropped = {email for email in users if email not in new and email not in existing and email not in self._seen}
+        self._seen.update(users.keys() - dropped)
+        db.rollback()  # release the connection before the slow part
+
+        to_hash = [email for email, hashed in new.items() if hashed is None]
+        plain = [passwords[email][0] for email in to_hash]
+        if pool is not None and plain:
+            hashes = pool.map(
+                bcrypt_hash, plain, repeat(self.rounds), chunksize=max(1, len(plain) // (self.workers * 4))
+            )
+        else:
+            hashes = map(bcrypt_hash, plain, repeat(self.rounds))
+        return _Batch(
+            users={email: name for email, name in users.items() if email not in dropped},
+            new=new,
+            to_hash=to_hash,
+            hashes=hashes,
+            memberships=[m for m in memberships if m[0] not in dropped],
+            records=len(batch),
+        )
+
+    def _write(self, db: Session, batch: _Batch, report: ImportReport, start: float, progress):
+        waited = time.perf_counter()
+        hashed = dict(zip(batch.to_hash, batch.hashes))
+        report.hash_wait += time.perf_counter() - waited
+
+        now = datetime.utcnow()
+        created = self._upsert_users(db, [
+            (email, batch.users[email], given or hashed[email], now) for email, given in batch.new.items()
+        ])
+        # the others were registered meanwhile (ON CONFLICT DO NOTHING)
+        report.users_created += created
+        report.users_existing += len(batch.new) - created
+
+        if batch.memberships:
+            ids = dict(db.execute(select(User.email, User.id).where(User.email.in_(list(batch.users)))).all())
+            group_ids = self._resolve_groups(db, batch.memberships, ids, now, report)
+            rows = {}
+            for email, group, role in batch.memberships:
+                rows.setdefault((group_ids[group], ids[email]), role)
+            added = self._insert_memberships(db, [(*key, role) for key, role in rows.items()])
+            if added:
+                bump_group_version(db, *{group_id for group_id, _ in rows})
+            report.memberships_added += added
+        db.commit()
+
+        report.records += batch.records
+        report.elapsed = time.perf_counter() - start
+        if progress is not None:
+            progress(report)
+
+    def _resolve_groups(self, db: Session, memberships, ids: dict, now: datetime, report: ImportReport) -> dict:
+        owners = {}
+        for email, group, role in memberships:
+            if group not in self._groups and (group not in owners or role == "admin" and owners[group][1] != "admin"):
+                owners[group] = (ids[email], role)
+        if owners:
+            created = db.execute(insert(Group).returning(Group.id, Group.name), [
+                {"name": name, "owner_id": owner_id, "created_at": now, "version": 1}
+                for name, (owner_id, _) in owners.items()
+            ])
+            for group_id, name in created:
+                self._groups[name] = group_id
+            report.groups_created += len(owners)
+        return self._groups
+
+    def _upsert_users(self, db: Session, rows: list[tuple]) -> int:
+        """Insert the users whose email is still free; returns how many."""
+        if not rows:
+            return 0
+        if self.use_copy:
+            self._copy(db, "users", ("email", "username", "hashed_password", "created_at"), rows)
+            return db.connection().exec_driver_sql(
+                "INSERT INTO users (email, username, hashed_password, created_at) "
+                "SELECT email, username, hashed_password, created_at FROM import_users "
+                "ON CONFLICT (email) DO NOTHING"
+            ).rowcount
+        created = 0
+        for chunk in _batched(rows, INSERT_CHUNK):
+            created += db.execute(dialect_insert(db, User).values([
+                {"email": email, "username": username, "hashed_password": hashed, "created_at": created_at}
+                for email, username, hashed, created_at in chunk
+            ]).on_conflict_do_nothing(index_elements=["email"])).rowcount
+        return created
+
+    def _insert_memberships(self, db: Session, rows: list[tuple]) -> int:
+        if self.use_copy:
+            self._copy(db, "group_members", ("group_id", "user_id", "role"), rows)
+            return db.connection().exec_driver_sql(
+                "INSERT INTO group_members (group_id, user_id, role) "
+                "SELECT group_id, user_id, role FROM import_group_members "
+                "ON CONFLICT (group_id, user_id) DO NOTHING"
+            ).rowcount
+        added = 0
+        for chunk in _batched(rows, INSERT_CHUNK):
+            added += db.execute(dialect_insert(db, GroupMember).values([
+                {"group_id": group_id, "user_id": user_id, "role": role} for group_id, user_id, role in chunk
+            ]).on_conflict_do_nothing(index_elements=["group_id", "user_id"])).rowcount
+        return added
+
+    @staticmethod
+    def _copy(db: Session, table: str, columns: tuple, rows: list[tuple]):
+        """COPY ``rows`` into ``import_<table>``, a temporary table shaped like
+        ``columns`` of ``table`` and dropped at commit."""
+        connection = db.connection()
+        names = ", ".join(columns)
+        connection.exec_driver_sql(
+            f"CREATE TEMP TABLE import_{table} ON COMMIT DROP AS SELECT {names} FROM {table} WITH NO DATA"
+        )
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            if hasattr(cursor, "copy_expert"):  # psycopg2
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(rows)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY import_{table} ({names}) FROM STDIN WITH (FORMAT csv)", buffer)
+            else:  # psycopg 3
+                with cursor.copy(f"COPY import_{table} ({names}) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+        finally:
+            cursor.close()
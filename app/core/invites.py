@@ -0,0 +1,28 @@
+# app/core/invites.py
+"""Invite lifetime: new invites expire after ``INVITE_TTL_HOURS`` and a
+periodic job deletes the used and expired ones, so ``invites`` (and its
+token index) only holds live invites."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.jobs import job
+from app.models import Invite
+
+
+def expiry() -> datetime | None:
+    if settings.INVITE_TTL_HOURS <= 0:
+        return None
+    return datetime.utcnow() + timedelta(hours=settings.INVITE_TTL_HOURS)
+
+
+def is_live():
+    """Filter for invites that can still be used."""
+    return (Invite.used == False) & or_(Invite.expires_at.is_(None), Invite.expires_at > datetime.utcnow())
+
+
+@job("invites.sweep", every=settings.INVITE_SWEEP_INTERVAL_SECONDS)
+def sweep(db: Session):
+    db.execute(delete(Invite).where(or_(Invite.used == True, Invite.expires_at <= datetime.utcnow())))
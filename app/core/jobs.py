@@ -0,0 +1,202 @@
+# app/core/jobs.py
+"""Background jobs, stored in the ``jobs`` table.
+
+Handlers register with ``@job(kind)`` and are called as ``fn(db, **payload)``
+in their own session, committed when they return. Request handlers call
+``enqueue(db, kind, **payload)``: the job becomes visible with the request's
+own commit, and is run later by a worker.
+
+Workers (``worker_loop``, started by the app lifespan when ``JOBS_ENABLED``
+or standalone with ``python -m app.cli worker``) claim due jobs with
+``FOR UPDATE SKIP LOCKED`` and run up to ``JOB_CONCURRENCY`` at a time in the
+threadpool, so any number of processes can share the queue. A claimed job
+is leased for ``JOB_LEASE_SECONDS``: if its worker dies, another one picks it
+up once the lease runs out.
+
+Failures are retried with exponential backoff up to ``JOB_MAX_ATTEMPTS``,
+then kept as ``failed`` (with the error) for ``JOB_FAILED_RETENTION_DAYS``.
+Periodic jobs (``@job(kind, every=seconds)``) are one row per kind that is
+rescheduled after each run instead of being deleted.
+"""
+import asyncio
+import importlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.database import SessionLocal, dialect_insert
+from app.models import Job
+
+logger = logging.getLogger(__name__)
+
+# modules whose import registers the handlers
+HANDLER_MODULES = ("app.core.archive", "app.core.invites", "app.core.stats")
+
+
+@dataclass(frozen=True)
+class Handler:
+    fn: Callable
+    every: int = 0  # seconds between runs of a periodic job; 0: on demand only
+
+
+HANDLERS: dict[str, Handler] = {}
+
+
+def job(kind: str, every: int = 0):
+    def decorator(fn):
+        HANDLERS[kind] = Handler(fn, every)
+        return fn
+    return decorator
+
+
+def load_handlers():
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+def enqueue(db: Session, kind: str, delay: float = 0, **payload) -> Job:
+    """Queue a job in the caller's transaction; the caller commits."""
+    queued = Job(kind=kind, payload=payload, run_at=datetime.utcnow() + timedelta(seconds=delay))
+    db.add(queued)
+    return queued
+
+
+def schedule(db: Session):
+    """Create or update the row of each periodic job, drop disabled ones."""
+    periodic = {kind: handler.every for kind, handler in HANDLERS.items() if handler.every > 0}
+    db.execute(delete(Job).where(Job.unique_key.is_not(None), Job.unique_key.not_in(periodic)))
+    if not periodic:
+        return
+    stmt = dialect_insert(db, Job)
+    db.execute(
+        stmt.on_conflict_do_update(index_elements=["unique_key"], set_={"every": stmt.excluded.every}),
+        [
+            {"kind": kind, "unique_key": kind, "every": every, "payload": {}, "status": "pending",
+             "run_at": datetime.utcnow(), "attempts": 0}
+            for kind, every in sorted(periodic.items())
+        ],
+    )
+
+
+def claim(db: Session, limit: int) -> list[tuple]:
+    """Lease up to ``limit`` due jobs (pending, or running past their lease)."""
+    now = datetime.utcnow()
+    due = db.scalars(
+        select(Job)
+        .where(Job.status.in_(("pending", "running")), Job.run_at <= now)
+        .order_by(Job.run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    claimed = []
+    for queued in due:
+        queued.status = "running"
+        queued.run_at = now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        queued.attempts += 1
+        claimed.append((queued.id, queued.kind, queued.payload, queued.attempts))
+    db.commit()
+    return claimed
+
+
+def finish(db: Session, job_id: int, attempts: int, error: str | None):
+    queued = db.get(Job, job_id, with_for_update=True)
+    if queued is None:
+        return
+    now = datetime.utcnow()
+    if queued.every:
+        # periodic: next run on schedule, whatever happened to this one
+        queued.status, queued.attempts, queued.last_error = "pending", 0, error
+        queued.run_at = now + timedelta(seconds=queued.every)
+    elif error is None:
+        db.delete(queued)
+    elif attempts >= settings.JOB_MAX_ATTEMPTS:
+        queued.status, queued.last_error, queued.run_at = "failed", error, now
+    else:
+        queued.status, queued.last_error = "pending", error
+        queued.run_at = now + timedelta(seconds=settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+def run(job_id: int, kind: str, payload: dict, attempts: int):
+    error = None
+    try:
+        handler = HANDLERS.get(kind)
+        if handler is None:
+            raise LookupError(f"no handler for job {kind!r}")
+        with SessionLocal() as db:
+            handler.fn(db, **payload)
+            db.commit()
+    except Exception as exc:
+        logger.exception("job %s #%d failed (attempt %d)", kind, job_id, attempts)
+        error = f"{type(exc).__name__}: {exc}"
+    with SessionLocal() as db:
+        finish(db, job_id, attempts, error)
+        db.commit()
+
+
+def run_pending(limit: int = 100) -> int:
+    """Run due jobs in the calling thread until none is left; returns how many ran."""
+    ran = 0
+    while True:
+        with SessionLocal() as db:
+            claimed = claim(db, limit)
+        if not claimed:
+            return ran
+        for args in claimed:
+            run(*args)
+        ran += len(claimed)
+
+
+def _claim(limit: int) -> list[tuple]:
+    with SessionLocal() as db:
+        return claim(db, limit)
+
+
+def _schedule():
+    with SessionLocal() as db:
+        schedule(db)
+        db.commit()
+
+
+async def worker_loop():
+    load_handlers()
+    # the database may not be up yet: retry, backing off to a minute
+    delay = settings.JOB_POLL_SECONDS
+    while True:
+        try:
+            await run_in_threadpool(_schedule)
+            break
+        except Exception:
+            logger.exception("scheduling periodic jobs failed, retrying in %.1fs", delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 60)
+    running = set()
+    while True:
+        free = settings.JOB_CONCURRENCY - len(running)
+        claimed = []
+        if free > 0:
+            try:
+                claimed = await run_in_threadpool(_claim, free)
+            except Exception:
+                logger.exception("claiming jobs failed")
+        for args in claimed:
+            task = asyncio.create_task(run_in_threadpool(run, *args))
+            running.add(task)
+            task.add_done_callback(running.discard)
+        if not claimed or len(running) >= settings.JOB_CONCURRENCY:
+            # idle or full: wait for a slot or the next poll
+            if running:
+                await asyncio.wait(running, timeout=settings.JOB_POLL_SECONDS, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                await asyncio.sleep(settings.JOB_POLL_SECONDS)
+
+
+@job("jobs.purge", every=86400)
+def purge_failed(db: Session):
+    cutoff = datetime.utcnow() - timedelta(days=settings.JOB_FAILED_RETENTION_DAYS)
+    db.execute(delete(Job).where(Job.status == "failed", Job.run_at < cutoff))
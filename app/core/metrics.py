@@ -0,0 +1,268 @@
+# app/core/metrics.py
+"""Per-request performance instrumentation.
+
+``MetricsMiddleware`` opens a ``RequestMetrics`` for every HTTP request and
+keeps it in a context variable. SQLAlchemy cursor events add each statement
+and its duration, ``timed("auth")`` wraps authentication, and
+``InstrumentedRoute`` records the route template and the time spent turning
+the endpoint's return value into a response.
+
+The totals go out as a ``Server-Timing`` header and into in-process
+histograms served in the Prometheus text format at ``/metrics`` (each
+worker process reports its own). With ``QUERY_WARN_THRESHOLD`` set, requests
+running more statements than that are logged with their most repeated
+statement, which is what an N+1 pattern looks like.
+"""
+import functools
+import inspect
+import logging
+import threading
+import time
+from bisect import bisect_left
+import collections
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+@dataclass
+class RequestMetrics:
+    route: str = "unmatched"
+    queries: int = 0
+    db: float = 0.0
+    auth: float = 0.0
+    serialize: float = 0.0
+    endpoint_done: float | None = None
+    statements: collections.Counter | None = field(default=None, repr=False)
+
+    def server_timing(self, total: float) -> str:
+        return ", ".join([
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f"auth;dur={self.auth * 1000:.1f}",
+            f"serialize;dur={self.serialize * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ])
+
+
+current: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+# -----------------------------
+# Histograms and counters (Prometheus text exposition)
+# -----------------------------
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple, buckets: tuple):
+        self.name, self.help, self.labels, self.buckets = name, help, labels, buckets
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # per-bucket counts (last one is +Inf), sum
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in sorted(series):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, labels))
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {total}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple):
+        self.name, self.help, self.labels = name, help, labels
+        self._series: dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: int = 1):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            series = sorted(self._series.items())
+        for labels, value in series:
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, labels))
+            lines.append(f"{self.name}{{{base}}} {value}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+request_seconds = Histogram(
+    "http_request_duration_seconds", "Request latency.", ("method", "route", "status"), LATENCY_BUCKETS
+)
+request_queries = Histogram(
+    "http_request_db_queries", "SQL statements per request.", ("route",), QUERY_BUCKETS
+)
+phase_seconds = Histogram(
+    "http_request_phase_seconds", "Time per request spent in the database, auth and serialization.",
+    ("route", "phase"), LATENCY_BUCKETS,
+)
+# everything /metrics renders; other modules append their own
+COLLECTORS = [request_seconds, request_queries, phase_seconds]
+
+
+def metrics_endpoint(request: Request) -> Response:
+    body = "\n".join(line for collector in COLLECTORS for line in collector.render()) + "\n"
+    return Response(body, media_type="text/plain; version=0.0.4")
+
+
+# -----------------------------
+# Collection
+# -----------------------------
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = current.get()
+    if metrics is None or not conn.info.get("query_start"):
+        return
+    metrics.db += time.perf_counter() - conn.info["query_start"].pop()
+    metrics.queries += 1
+    if metrics.statements is not None:
+        metrics.statements[statement] += 1
+
+
+def timed(phase: str):
+    """Add the run time of the decorated function to the request's ``phase``."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metrics = current.get()
+                if metrics is not None:
+                    setattr(metrics, phase, getattr(metrics, phase) + time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def _mark_endpoint_done(endpoint):
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _set_endpoint_done()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                _set_endpoint_done()
+    return wrapper
+
+
+def _set_endpoint_done():
+    metrics = current.get()
+    if metrics is not None:
+        metrics.endpoint_done = time.perf_counter()
+
+
+class InstrumentedRoute(APIRoute):
+    """Records the route template and the serialization time of the response."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _mark_endpoint_done(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        template = self.path_format
+
+        async def instrumented_handler(request: Request) -> Response:
+            metrics = current.get()
+            if metrics is None:
+                return await handler(request)
+            metrics.route = template
+            response = await handler(request)
+            if metrics.endpoint_done is not None:
+                metrics.serialize += time.perf_counter() - metrics.endpoint_done
+            return response
+
+        return instrumented_handler
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: one ``RequestMetrics`` per HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            return await self.app(scope, receive, send)
+
+        metrics = RequestMetrics(statements=collections.Counter() if settings.QUERY_WARN_THRESHOLD > 0 else None)
+        token = current.set(metrics)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", metrics.server_timing(time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current.reset(token)
+            _record(scope["method"], metrics, status, time.perf_counter() - start)
+
+
+def _record(method: str, metrics: RequestMetrics, status: int, total: float):
+    request_seconds.observe(total, method, metrics.route, str(status))
+    if metrics.route == "unmatched":
+        # static files and 404s: keep them out of the per-route series
+        return
+    request_queries.observe(metrics.queries, metrics.route)
+    for phase in ("db", "auth", "serialize"):
+        phase_seconds.observe(getattr(metrics, phase), metrics.route, phase)
+
+    if metrics.statements is not None and metrics.queries > settings.QUERY_WARN_THRESHOLD:
+        statement, repeats = metrics.statements.most_common(1)[0]
+        logger.warning(
+            "%s %s ran %d queries (threshold %d); most repeated (%dx): %s",
+            method, metrics.route, metrics.queries, settings.QUERY_WARN_THRESHOLD,
+            repeats, " ".join(statement.split())[:300],
+        )
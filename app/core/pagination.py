@@ -0,0 +1,71 @@
+# app/core/pagination.py
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just after the row (created_at, id)."""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(400, "Curseur invalide")
+
+
+def encode_sort_cursor(sort_key: str, row_id: int) -> str:
+    """Opaque cursor pointing just after the row (sort_key, id), for listings
+    ordered on a text column."""
+    raw = json.dumps([sort_key, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sort_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return str(sort_key), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(400, "Curseur invalide")
+
+
+def keyset_page(query, created_col, id_col, limit: int, cursor: str | None = None):
+    """Return (rows, next_cursor) for a query ordered on (created_at, id).
+
+    Only ``limit + 1`` rows are fetched, so the cost depends on the page size
+    and not on the number of rows matching the query.
+    """
+    if cursor:
+        query = query.filter(tuple_(created_col, id_col) > decode_cursor(cursor))
+
+    rows = query.order_by(created_col, id_col).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+    return rows, next_cursor
+
+
+def merge_keyset_pages(pages, created_key: str, id_key: str, limit: int):
+    """Merge the ``keyset_page`` results of several queries, fetched with the
+    same cursor and limit, into one page over their combined ordering."""
+    rows = sorted(
+        (row for page_rows, _ in pages for row in page_rows),
+        key=lambda row: (getattr(row, created_key), getattr(row, id_key)),
+    )
+    if len(rows) <= limit and not any(next_cursor for _, next_cursor in pages):
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, created_key), getattr(last, id_key))
@@ -0,0 +1,31 @@
+# app/core/passwords.py
+"""bcrypt primitives.
+
+This is the module the hashing processes (app/core/hashing.py) import to
+unpickle their tasks: keep its imports to the standard library and bcrypt,
+so each of those processes stays small and starts fast.
+"""
+import os
+
+import bcrypt
+
+
+def bcrypt_hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+
+def bcrypt_verify(password: str, hashed: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode(), hashed.encode())
+    except ValueError:
+        return False
+
+def bcrypt_cost(hashed: str) -> int | None:
+    """Cost factor stored in a ``$2b$<cost>$...`` hash."""
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+def lower_priority():
+    # hashing yields the CPU to the request-serving processes
+    os.nice(10)
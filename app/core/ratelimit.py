@@ -0,0 +1,127 @@
+# app/core/ratelimit.py
+"""Token-bucket rate limiting.
+
+Rules live in ``settings.RATE_LIMITS`` as ``"<count>/<period>"`` (a bucket
+of ``count`` tokens refilled at ``count`` per period). Each hit on
+``rule:identity`` takes a token or fails with a 429 carrying Retry-After.
+
+Backends:
+
+* ``memory``: per process, a bounded LRU of buckets; no I/O.
+* ``postgres``: one atomic upsert per hit on ``rate_limit_buckets``, so the
+  limits hold across every worker.
+
+Checks run before any bcrypt work: ``limit_by_ip(rule)`` as a route
+dependency, ``limiter.hit(rule, identity)`` at the top of a handler for
+identities taken from the body (the account being logged into).
+"""
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class Limit:
+    capacity: float
+    rate: float  # tokens per second
+
+    @classmethod
+    def parse(cls, spec: str) -> "Limit":
+        count, _, period = spec.partition("/")
+        return cls(capacity=float(count), rate=float(count) / PERIODS[period.strip()])
+
+
+class MemoryBackend:
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, limit: Limit) -> tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - updated) * limit.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, (1 - tokens) / limit.rate
+
+
+class PostgresBackend:
+    HIT = text("""
+        INSERT INTO rate_limit_buckets AS b (key, tokens, updated_at, allowed)
+        VALUES (:key, :capacity - 1, extract(epoch FROM now()), true)
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = least(:capacity, b.tokens + (extract(epoch FROM now()) - b.updated_at) * :rate)
+                     - CASE WHEN least(:capacity, b.tokens + (extract(epoch FROM now()) - b.updated_at) * :rate) >= 1
+                            THEN 1 ELSE 0 END,
+            allowed = least(:capacity, b.tokens + (extract(epoch FROM now()) - b.updated_at) * :rate) >= 1,
+            updated_at = extract(epoch FROM now())
+        RETURNING allowed, tokens
+    """)
+    # buckets that have refilled completely carry no state
+    PURGE = text("DELETE FROM rate_limit_buckets WHERE updated_at < extract(epoch FROM now()) - :max_age")
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def _hit(self, key: str, limit: Limit) -> tuple[bool, float]:
+        with self.engine.begin() as conn:
+            allowed, tokens = conn.execute(
+                self.HIT, {"key": key, "capacity": limit.capacity, "rate": limit.rate}
+            ).one()
+            if random.random() < 0.001:
+                conn.execute(self.PURGE, {"max_age": PERIODS["day"]})
+        return allowed, (1 - tokens) / limit.rate
+
+    async def hit(self, key: str, limit: Limit) -> tuple[bool, float]:
+        return await run_in_threadpool(self._hit, key, limit)
+
+
+class RateLimiter:
+    def __init__(self, backend, rules: dict[str, str]):
+        self.backend = backend
+        self.limits = {rule: Limit.parse(spec) for rule, spec in rules.items() if spec}
+
+    async def hit(self, rule: str, identity: str):
+        limit = self.limits.get(rule)
+        if limit is None:
+            return
+        allowed, retry_after = await self.backend.hit(f"{rule}:{identity}", limit)
+        if not allowed:
+            raise HTTPException(
+                429, "Trop de tentatives, réessayez plus tard",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+
+def _backend():
+    if settings.RATE_LIMIT_BACKEND == "postgres":
+        from app.database import engine
+        return PostgresBackend(engine)
+    return MemoryBackend(settings.RATE_LIMIT_MEMORY_KEYS)
+
+
+limiter = RateLimiter(_backend(), settings.RATE_LIMITS)
+
+
+def limit_by_ip(rule: str):
+    """Route dependency applying ``rule`` to the client address."""
+    async def dependency(request: Request):
+        await limiter.hit(rule, request.client.host if request.client else "unknown")
+    return dependency
@@ -0,0 +1,202 @@
+# app/core/readcache.py
+"""Read-model cache for the group-scoped read endpoints.
+
+Group detail, member lists, task pages and the dashboard are stored already
+serialized (JSON bytes) under their ETag, which is derived from the group's
+``version``. Every mutation bumps that version in its own transaction (the
+archive job, the importer and other processes included), which is what
+invalidates: once it commits, no request looks up the old keys again, so a
+cached body is never served for a newer state of the group, whichever
+worker or replica answers. The old entries simply age out of the LRU or
+expire after ``READ_CACHE_TTL_SECONDS``; nothing keeps a per-group index of
+them.
+
+Backends (``READ_CACHE_BACKEND``):
+
+* ``memory``: per process, a bounded LRU with a TTL (the default).
+* ``redis``: shared by every worker, at ``READ_CACHE_URL`` (needs the
+  optional ``redis`` package). ``RedisBackend`` only uses a handful of
+  client methods, so any object providing them can stand in for it.
+* ``none``: disabled.
+
+Concurrent misses on the same key are coalesced (single flight): one request
+loads and renders, the others wait for its result, up to
+``READ_CACHE_FLIGHT_TIMEOUT_SECONDS``, then load it themselves.
+"""
+import asyncio
+import logging
+import threading
+
+from pydantic import TypeAdapter
+from sqlalchemy.util import await_only
+from starlette.responses import Response
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import COLLECTORS, Counter
+
+logger = logging.getLogger(__name__)
+
+read_cache_requests = Counter(
+    "read_cache_requests_total", "Read-model cache lookups by result (hit, miss, coalesced).", ("kind", "result")
+)
+COLLECTORS.append(read_cache_requests)
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize, ttl)
+
+    def get(self, key) -> bytes | None:
+        return self.cache.get(key)
+
+    def set(self, key, value: bytes):
+        self.cache.set(key, value)
+
+
+class RedisBackend:
+    def __init__(self, client, ttl: int, prefix: str = "readcache:"):
+        self.client, self.ttl, self.prefix = client, ttl, prefix
+
+    def get(self, key) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value: bytes):
+        self.client.set(self.prefix + key, value, ex=self.ttl)
+
+
+class _Flight:
+    """One in-progress load; followers wait on it from threads or greenlets."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: bytes | None = None  # None when the leader failed
+        self.waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def finish(self, value: bytes | None):
+        self.value = value
+        self.done.set()
+        for loop, future in self.waiters:
+            loop.call_soon_threadsafe(_resolve, future, value)
+
+
+def _resolve(future: asyncio.Future, value):
+    if not future.done():
+        future.set_result(value)
+
+
+class ReadCache:
+    def __init__(self, backend, flight_timeout: float):
+        self.backend = backend
+        self.flight_timeout = flight_timeout
+        self._flights: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, kind: str, group_id: int, etag: str, loader) -> bytes:
+        """Body for ``etag``: from the cache, another request's load, or ``loader()``."""
+        key = "%s:%s:%s" % (group_id, kind, etag.removeprefix("W/").strip('"'))
+        body = self._get(key)
+        if body is not None:
+            read_cache_requests.inc(kind, "hit")
+            return body
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                waiter = self._waiter(flight)
+
+        if not leader:
+            body = self._wait(flight, waiter)
+            if body is not None:
+                read_cache_requests.inc(kind, "coalesced")
+                return body
+
+        read_cache_requests.inc(kind, "miss")
+        body = None
+        try:
+            body = loader()
+            self._set(key, body)
+            return body
+        finally:
+            if leader:
+                with self._lock:
+                    self._flights.pop(key, None)
+                flight.finish(body)
+
+    # a shared backend being unreachable degrades to uncached reads
+    def _get(self, key) -> bytes | None:
+        try:
+            return self.backend.get(key)
+        except Exception:
+            logger.warning("read cache lookup failed", exc_info=True)
+            return None
+
+    def _set(self, key, body: bytes):
+        try:
+            self.backend.set(key, body)
+        except Exception:
+            logger.warning("read cache store failed", exc_info=True)
+
+    def _waiter(self, flight: _Flight):
+        # async mode: handlers run in greenlets on the event loop, which must
+        # not block; called under self._lock so the leader cannot miss it
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        future = loop.create_future()
+        flight.waiters.append((loop, future))
+        return future
+
+    def _wait(self, flight: _Flight, waiter) -> bytes | None:
+        if waiter is None:
+            flight.done.wait(self.flight_timeout)
+            return flight.value
+        if flight.done.is_set():
+            return flight.value
+        try:
+            return await_only(asyncio.wait_for(waiter, self.flight_timeout))
+        except asyncio.TimeoutError:
+            return None
+
+    def respond(self, kind: str, group_id: int, etag: str | None, response: Response, loader) -> Response:
+        """JSON response for a group read, keeping the headers set on ``response``."""
+        body = loader() if etag is None else self.fetch(kind, group_id, etag, loader)
+        return Response(body, media_type="application/json", headers=response.headers)
+
+
+class NullCache(ReadCache):
+    def __init__(self):
+        super().__init__(None, 0)
+
+    def fetch(self, kind: str, group_id: int, etag: str, loader) -> bytes:
+        return loader()
+
+
+_ADAPTERS: dict = {}
+
+
+def render(model, content) -> bytes:
+    """``content`` validated (ORM attributes allowed) and serialized as ``model``."""
+    adapter = _ADAPTERS.get(model)
+    if adapter is None:
+        adapter = _ADAPTERS[model] = TypeAdapter(model)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+def _cache() -> ReadCache:
+    if settings.READ_CACHE_BACKEND == "none":
+        return NullCache()
+    if settings.READ_CACHE_BACKEND == "redis":
+        import redis
+        backend = RedisBackend(redis.Redis.from_url(settings.READ_CACHE_URL), settings.READ_CACHE_TTL_SECONDS)
+    else:
+        backend = MemoryBackend(settings.READ_CACHE_SIZE, settings.READ_CACHE_TTL_SECONDS)
+    return ReadCache(backend, settings.READ_CACHE_FLIGHT_TIMEOUT_SECONDS)
+
+
+read_cache = _cache()
+
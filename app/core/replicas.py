@@ -0,0 +1,105 @@
+# app/core/replicas.py
+"""Read replicas: round-robin selection and read-your-writes stickiness.
+
+``get_read_db`` (app/database.py) hands read-only endpoints a session on the
+next healthy replica of ``DATABASE_REPLICA_URLS``. A replica that cannot
+hand out a connection (the pool pre-pings it) is skipped for
+``REPLICA_RETRY_SECONDS``; with none available, reads go to the primary.
+
+Replicas lag behind the primary, so a client that just wrote must not read
+from them for a moment: ``ReadYourWritesMiddleware`` answers every
+successful mutation with a short-lived cookie, and requests carrying it read
+from the primary. Being a cookie, the window holds whichever worker process
+serves the next request.
+"""
+import itertools
+import logging
+import threading
+import time
+
+from sqlalchemy.exc import DBAPIError
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STICKY_COOKIE = "rw"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaSet:
+    def __init__(self, engines: list, retry_seconds: float):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._down_until = [0.0] * len(engines)
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def _candidates(self) -> list[int]:
+        """Replica indexes to try, in round-robin order, healthy ones only."""
+        with self._lock:
+            start = next(self._turn)
+        now = time.monotonic()
+        count = len(self.engines)
+        return [
+            index for index in ((start + offset) % count for offset in range(count))
+            if self._down_until[index] <= now
+        ]
+
+    def _failed(self, index: int):
+        logger.warning("read replica %d unavailable, skipped for %ss", index, self.retry_seconds, exc_info=True)
+        self._down_until[index] = time.monotonic() + self.retry_seconds
+
+    def connect(self):
+        """Connection to a healthy replica, or None."""
+        for index in self._candidates():
+            try:
+                return self.engines[index].connect()
+            except DBAPIError:
+                self._failed(index)
+        return None
+
+    async def connect_async(self):
+        for index in self._candidates():
+            try:
+                return await self.engines[index].connect()
+            except DBAPIError:
+                self._failed(index)
+        return None
+
+
+def sticky(connection: HTTPConnection) -> bool:
+    """Whether the client wrote recently and must read from the primary."""
+    return STICKY_COOKIE in connection.cookies
+
+
+def _cookie() -> str:
+    return f"{STICKY_COOKIE}=1; Max-Age={settings.REPLICA_STICKY_SECONDS}; Path=/; HttpOnly; SameSite=Lax"
+
+
+def stick(response):
+    """Start the read-your-writes window from a handler that writes on a safe
+    method (the middleware only covers the others)."""
+    if settings.DATABASE_REPLICA_URLS:
+        response.headers.append("Set-Cookie", _cookie())
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware setting the stickiness cookie on successful mutations."""
+
+    def __init__(self, app):
+        self.app = app
+        self.cookie = _cookie()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            return await self.app(scope, receive, send)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append("Set-Cookie", self.cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,27 +1,28 @@
 # app/core/security.py
-import bcrypt
+from dataclasses import dataclass
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from datetime import datetime, timedelta
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.passwords import bcrypt_hash, bcrypt_verify
+from app.core.metrics import timed
 from app.database import get_db
 from app.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-# Hashing helpers (names used across the project)
+# Blocking hashing helpers (names used across the project); request
+# handlers go through app.core.hashing.password_hasher instead
 def hash_password(password: str) -> str:
-    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
-    return hashed.decode()
+    return bcrypt_hash(password, settings.BCRYPT_ROUNDS)
 
 def verify_password(password: str, hashed: str) -> bool:
-    try:
-        return bcrypt.checkpw(password.encode(), hashed.encode())
-    except ValueError:
-        return False
+    return bcrypt_verify(password, hashed)
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
@@ -29,6 +30,33 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
+def user_claims(user: User) -> dict:
+    """Token claims; carries enough identity for the claims-only mode."""
+    return {"sub": str(user.id), "email": user.email, "username": user.username}
+
+
+# -----------------------------
+# PRINCIPAL CACHE
+# -----------------------------
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated identity handed to the routes instead of the ORM ``User``."""
+    id: int
+    email: str
+    username: str
+
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+def invalidate_principal(user_id: int):
+    principal_cache.pop(user_id)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    invalidate_principal(target.id)
+
+
+@timed("auth")
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
@@ -44,11 +72,26 @@ def get_current_user(
         user_id = payload.get("sub")
         if not user_id:
             raise credentials_exception
-    except JWTError:
+        user_id = int(user_id)
+    except (JWTError, ValueError):
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    # claims-only mode: trust the signed token, never touch the database
+    if settings.AUTH_CLAIMS_ONLY and "email" in payload and "username" in payload:
+        return Principal(id=user_id, email=payload["email"], username=payload["username"])
+
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise credentials_exception
 
-    return user
+    principal = Principal(id=user.id, email=user.email, username=user.username)
+    principal_cache.set(user_id, principal)
+    if settings.DATABASE_REPLICA_URLS:
+        # read endpoints then work on a replica: do not keep a primary
+        # connection checked out for the rest of the request
+        db.close()
+    return principal
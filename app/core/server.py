@@ -0,0 +1,89 @@
+# app/core/server.py
+"""Production server: ``python -m app.cli serve``.
+
+With gunicorn installed (optional, not a dependency of the app) a master
+process imports the app once (``preload_app``) and forks the uvicorn
+workers, which then share the imported code and data copy-on-write instead
+of each importing the whole app. Without gunicorn, uvicorn's own process
+manager starts the workers, each importing the app itself.
+
+uvicorn selects uvloop and httptools when they are installed (they come
+with ``uvicorn[standard]``), with asyncio and h11 as the fallback.
+"""
+import importlib.util
+import os
+
+from app.core.config import settings
+
+APP = "app.main:app"
+
+
+def worker_count(requested: int = 0) -> int:
+    return requested or settings.SERVER_WORKERS or os.cpu_count() or 1
+
+
+def _post_fork(server, worker):
+    # the master may have opened connections while importing the app; a
+    # socket shared between processes corrupts both sides
+    from app.database import async_engine, async_replicas, engine, replicas
+
+    engines = [engine, *replicas.engines]
+    if async_engine is not None:
+        engines += [e.sync_engine for e in (async_engine, *async_replicas.engines)]
+    for e in engines:
+        e.dispose(close=False)
+
+
+def _gunicorn(host: str, port: int, workers: int):
+    from gunicorn.app.base import BaseApplication
+
+    worker_class = (
+        "uvicorn_worker.UvicornWorker"
+        if importlib.util.find_spec("uvicorn_worker")
+        else "uvicorn.workers.UvicornWorker"
+    )
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": worker_class,
+        "preload_app": True,
+        "backlog": settings.SERVER_BACKLOG,
+        "keepalive": settings.SERVER_KEEPALIVE_SECONDS,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "post_fork": _post_fork,
+    }
+
+    class Application(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    Application().run()
+
+
+def _uvicorn(host: str, port: int, workers: int):
+    import uvicorn
+
+    uvicorn.run(
+        APP,
+        host=host,
+        port=port,
+        workers=workers,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        loop="auto",
+        http="auto",
+    )
+
+
+def serve(host: str | None = None, port: int | None = None, workers: int = 0, server: str = "auto"):
+    """``server``: "gunicorn", "uvicorn" or "auto" (gunicorn when installed)."""
+    if server == "auto":
+        server = "gunicorn" if importlib.util.find_spec("gunicorn") else "uvicorn"
+    run = _gunicorn if server == "gunicorn" else _uvicorn
+    run(host or settings.SERVER_HOST, port or settings.SERVER_PORT, worker_count(workers))
@@ -0,0 +1,119 @@
+# app/core/static.py
+"""Static frontend: build step and the StaticFiles that serves its output.
+
+``build`` (``python -m app.cli build-static``) copies ``frontend/`` to
+``frontend/dist/``, renaming every asset under ``static/`` to a
+content-hashed name (``app.3f2a9c1b.js``), pointing the HTML pages at those
+names, and writing ``.gz`` (and ``.br`` when the optional ``brotli`` package
+is installed) variants next to each text file.
+
+``PrecompressedStaticFiles`` serves the best variant the client accepts,
+with ``Cache-Control: immutable`` for hashed assets and ``no-cache`` (i.e.
+revalidate, usually a 304) for everything else, such as the pages.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8}\.\w+$")
+COMPRESSIBLE = (".html", ".js", ".css", ".json", ".svg", ".txt")
+IMMUTABLE = "public, max-age=31536000, immutable"
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        accepted = request_headers.get("accept-encoding", "")
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+
+        response = None
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            response = FileResponse(
+                f"{full_path}{suffix}", status_code=status_code, stat_result=variant_stat, media_type=media_type
+            )
+            response.headers["Content-Encoding"] = encoding
+            break
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, media_type=media_type)
+
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = IMMUTABLE if HASHED_NAME.search(str(full_path)) else "no-cache"
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def _compress(path: str):
+    if not path.endswith(COMPRESSIBLE):
+        return
+    with open(path, "rb") as f:
+        data = f.read()
+    variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", brotli.compress(data, quality=11)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            with open(path + suffix, "wb") as f:
+                f.write(compressed)
+
+
+def build(src: str, out: str) -> dict[str, str]:
+    """Build ``src`` into ``out`` (replaced); returns the asset name mapping."""
+    if os.path.isdir(out):
+        shutil.rmtree(out)
+    os.makedirs(out)
+    out_abs = os.path.abspath(out)
+
+    manifest = {}
+    for root, dirs, files in os.walk(src):
+        dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != out_abs]
+        rel_root = os.path.relpath(root, src)
+        if rel_root.split(os.sep)[0] != "static":
+            continue
+        for name in files:
+            rel = os.path.normpath(os.path.join(rel_root, name))
+            with open(os.path.join(root, name), "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()[:8]
+            stem, ext = os.path.splitext(rel)
+            hashed = f"{stem}.{digest}{ext}"
+            os.makedirs(os.path.join(out, os.path.dirname(hashed)), exist_ok=True)
+            shutil.copyfile(os.path.join(root, name), os.path.join(out, hashed))
+            _compress(os.path.join(out, hashed))
+            manifest[rel.replace(os.sep, "/")] = hashed.replace(os.sep, "/")
+
+    # longest first, so "static/app.js" never clobbers "static/app.js.map"
+    references = sorted(manifest, key=len, reverse=True)
+    for name in os.listdir(src):
+        if not name.endswith(".html"):
+            continue
+        with open(os.path.join(src, name), encoding="utf-8") as f:
+            page = f.read()
+        for original in references:
+            page = re.sub(rf"""(?<=["'/]){re.escape(original)}(?=["'?#])""", manifest[original], page)
+        with open(os.path.join(out, name), "w", encoding="utf-8") as f:
+            f.write(page)
+        _compress(os.path.join(out, name))
+
+    with open(os.path.join(out, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
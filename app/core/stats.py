@@ -0,0 +1,130 @@
+# app/core/stats.py
+"""Per-group task counters.
+
+``group_task_counts`` holds one row per (group, status, creator). Every task
+mutation records its +1/-1 changes in a ``TaskCounts`` and applies them with
+``apply`` inside its own transaction, so reading a group's stats is a lookup
+of a handful of rows instead of a scan of ``tasks``.
+
+``apply`` must run after ``bump_group_version``: the group row lock taken by
+the bump is what serializes mutations against ``rebuild``.
+"""
+from collections import Counter
+from datetime import datetime, time
+
+from sqlalchemy import delete, func, insert, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.etag import bump_group_version
+from app.core.jobs import job
+from app.database import dialect_insert
+from app.models import ArchivedTask, Group, GroupTaskCount, Task
+
+
+def status_key(status) -> str:
+    return status or ""
+
+
+class TaskCounts(Counter):
+    """Pending counter changes, keyed by (group_id, status, creator_id)."""
+
+    def add(self, group_id, status, creator_id, n: int = 1):
+        if group_id is not None and creator_id is not None:
+            self[(group_id, status_key(status), creator_id)] += n
+
+    def remove(self, group_id, status, creator_id):
+        self.add(group_id, status, creator_id, -1)
+
+
+def _upsert(db: Session):
+    stmt = dialect_insert(db, GroupTaskCount)
+    return stmt.on_conflict_do_update(
+        index_elements=["group_id", "status", "creator_id"],
+        set_={"count": GroupTaskCount.count + stmt.excluded.count},
+    )
+
+
+def apply(db: Session, counts: TaskCounts):
+    # sorted so that concurrent transactions lock counter rows in the same order
+    rows = [
+        {"group_id": g, "status": s, "creator_id": c, "count": n}
+        for (g, s, c), n in sorted(counts.items()) if n
+    ]
+    if rows:
+        db.execute(_upsert(db), rows)
+
+
+def status_counts(db: Session, group_id: int) -> dict[str, int]:
+    return dict(db.execute(
+        select(GroupTaskCount.status, func.sum(GroupTaskCount.count))
+        .where(GroupTaskCount.group_id == group_id, GroupTaskCount.count != 0)
+        .group_by(GroupTaskCount.status)
+    ).all())
+
+
+def group_stats(db: Session, group_id: int, today) -> dict:
+    by_status, by_creator, total = Counter(), Counter(), 0
+    for status, creator_id, count in db.execute(
+        select(GroupTaskCount.status, GroupTaskCount.creator_id, GroupTaskCount.count)
+        .where(GroupTaskCount.group_id == group_id, GroupTaskCount.count != 0)
+    ):
+        by_status[status] += count
+        by_creator[creator_id] += count
+        total += count
+
+    # time-dependent, so not a counter: an index range scan on
+    # (group_id, deadline) that only visits overdue rows
+    overdue = db.scalar(
+        select(func.count())
+        .select_from(Task)
+        .where(
+            Task.group_id == group_id,
+            Task.deadline < datetime.combine(today, time.min),
+            Task.status != "done",
+        )
+    )
+    return {
+        "group_id": group_id,
+        "total": total,
+        "by_status": dict(by_status),
+        "by_creator": dict(by_creator),
+        "overdue": overdue,
+    }
+
+
+def rebuild(db: Session, group_ids=None) -> int:
+    """Recompute the counters from ``tasks`` and ``tasks_archive`` (all groups, or ``group_ids``).
+
+    Locks the group rows first, so concurrent task mutations wait for it, and
+    bumps their versions: cached stats and dashboards of those groups go stale.
+    Returns the number of counter rows written; the caller commits.
+    """
+    groups = select(Group.id).order_by(Group.id).with_for_update()
+    if group_ids is not None:
+        groups = groups.where(Group.id.in_(group_ids))
+    ids = db.scalars(groups).all()
+    if not ids:
+        return 0
+
+    bump_group_version(db, *ids)
+    db.execute(delete(GroupTaskCount).where(GroupTaskCount.group_id.in_(ids)))
+    # archived tasks still count: archival moves rows, it never deletes them
+    tasks = union_all(*(
+        select(model.group_id, func.coalesce(model.status, "").label("status"), model.creator_id)
+        .where(model.group_id.in_(ids), model.creator_id.is_not(None))
+        for model in (Task, ArchivedTask)
+    )).subquery()
+    source = (
+        select(tasks.c.group_id, tasks.c.status, tasks.c.creator_id, func.count())
+        .group_by(tasks.c.group_id, tasks.c.status, tasks.c.creator_id)
+    )
+    result = db.execute(
+        insert(GroupTaskCount).from_select(["group_id", "status", "creator_id", "count"], source)
+    )
+    return result.rowcount
+
+
+@job("stats.rebuild", every=settings.STATS_REBUILD_INTERVAL_SECONDS)
+def rebuild_job(db: Session, group_ids=None):
+    rebuild(db, group_ids)
@@ -1,11 +1,57 @@
+import importlib
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from fastapi import Depends
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
 from app.core.config import settings
+from app.core.replicas import ReplicaSet, sticky
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+psycopg", "sqlite": "sqlite+aiosqlite"}
+
+def engine_options(url: str) -> dict:
+    """Pool settings from Settings; SQLite uses its own pools and ignores them."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
 
-engine = create_engine(settings.DATABASE_URL, future=True)
+def async_url(url: str) -> str:
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS[parsed.get_backend_name()]).render_as_string(hide_password=False)
+
+engine = create_engine(settings.DATABASE_URL, future=True, **engine_options(settings.DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replicas = ReplicaSet(
+    [create_engine(url, future=True, **engine_options(url)) for url in settings.DATABASE_REPLICA_URLS],
+    settings.REPLICA_RETRY_SECONDS,
+)
+
+# The async stack is only built when selected, so the sync mode never needs
+# an async driver.
+async_engine = None
+AsyncSessionLocal = None
+async_replicas = None
+if settings.DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    _async_url = settings.ASYNC_DATABASE_URL or async_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(_async_url, **engine_options(_async_url))
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False)
+    async_replicas = ReplicaSet(
+        [create_async_engine(async_url(url), **engine_options(url)) for url in settings.DATABASE_REPLICA_URLS],
+        settings.REPLICA_RETRY_SECONDS,
+    )
+
 Base = declarative_base()
 
 def get_db():
@@ -14,3 +60,52 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_read_db(request: Request, db=Depends(get_db)):
+    """Session for read-only endpoints: on a replica when one is configured
+    and healthy and the client has not written recently, else the request's
+    primary session (the one authentication used), so a request never holds
+    two connections from the same pool."""
+    connection = replicas.connect() if replicas.engines and not sticky(request) else None
+    if connection is None:
+        yield db
+        return
+    read_db = SessionLocal(bind=connection)
+    try:
+        yield read_db
+    finally:
+        read_db.close()
+        connection.close()
+
+# ``Depends(get_db)`` rather than get_async_db: in async mode get_db is
+# overridden by get_async_db, and sharing its cache key shares the session
+async def get_async_read_db(request: Request, db=Depends(get_db)):
+    connection = await async_replicas.connect_async() if async_replicas.engines and not sticky(request) else None
+    if connection is None:
+        yield db
+        return
+    read_db = AsyncSessionLocal(bind=connection)
+    try:
+        yield read_db
+    finally:
+        await read_db.close()
+        await connection.close()
+
+def dialect_insert(db, table):
+    """``insert(table)`` of the session's dialect, for ON CONFLICT clauses.
+
+    The dialect module is imported on first use: SQLite deployments never
+    load the PostgreSQL one.
+    """
+    name = db.get_bind().dialect.name
+    return importlib.import_module(f"sqlalchemy.dialects.{name}").insert(table)
+
+async def run_db(db, fn, *args):
+    """Run ``fn(session, *args)`` from an async handler, whichever stack ``db`` comes from."""
+    if hasattr(db, "run_sync"):
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
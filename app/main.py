@@ -1,9 +1,31 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auths, users, groups, tasks
+from fastapi.middleware.gzip import GZipMiddleware
+from app.core.config import settings
+from app.core.events import listen as listen_events
+from app.core.hashing import password_hasher
+from app.core.jobs import worker_loop
+from app.core.replicas import ReadYourWritesMiddleware
+from app.core.static import PrecompressedStaticFiles
+from app.core import metrics
+from app.routers import auths, users, groups, tasks, events
 
-app = FastAPI(title="TaskGroup App")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background = []
+    if settings.EVENTS_BACKEND == "postgres":
+        background.append(asyncio.create_task(listen_events()))
+    if settings.JOBS_ENABLED:
+        background.append(asyncio.create_task(worker_loop()))
+    yield
+    for task in background:
+        task.cancel()
+    password_hasher.shutdown()
+
+app = FastAPI(title="TaskGroup App", lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -13,12 +35,25 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# precompressed static files already carry a Content-Encoding and are left alone
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MIN_SIZE)
+
+if settings.DATABASE_REPLICA_URLS:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+    app.add_route("/metrics", metrics.metrics_endpoint, include_in_schema=False)
 
 # include APIs first
-app.include_router(auths.router)
-app.include_router(users.router)
-app.include_router(groups.router)
-app.include_router(tasks.router)
+routers = [auths.router, users.router, groups.router, tasks.router, events.router]
+if settings.DB_MODE == "async":
+    from app.core import aio
+    aio.install(app, routers)
+else:
+    for router in routers:
+        app.include_router(router)
 
 # mount frontend after routers so API routes are not intercepted by static files
-app.mount("/", StaticFiles(directory="frontend", html=True), name="frontend")
+frontend = settings.FRONTEND_BUILD_DIR if os.path.isdir(settings.FRONTEND_BUILD_DIR) else settings.FRONTEND_DIR
+app.mount("/", PrecompressedStaticFiles(directory=frontend, html=True), name="frontend")
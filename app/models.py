@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Text, Index, Float, JSON, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -15,12 +15,17 @@ class User(Base):
     memberships = relationship("GroupMember", back_populates="user")
     tasks = relationship("Task", back_populates="creator")
 
+# user directory order (case-insensitive name, then id) for keyset paging
+Index("ix_users_username_lower_id", func.lower(User.username), User.id)
+
 class Group(Base):
     __tablename__ = "groups"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     owner_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
+    # bumped by every mutation of the group, its members or its tasks (ETags)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     owner = relationship("User", back_populates="groups")
     members = relationship("GroupMember", back_populates="group")
@@ -36,6 +41,13 @@ class GroupMember(Base):
     group = relationship("Group", back_populates="members")
     user = relationship("User", back_populates="memberships")
 
+    __table_args__ = (
+        # one membership per user and group; also serves role lookups
+        Index("uq_group_members_group_user", "group_id", "user_id", unique=True),
+        # a user's groups (authorization, group lists, directory scope)
+        Index("ix_group_members_user_group", "user_id", "group_id"),
+    )
+
 class Invite(Base):
     __tablename__ = "invites"
     id = Column(Integer, primary_key=True, index=True)
@@ -58,4 +70,73 @@ class Task(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     creator = relationship("User", back_populates="tasks")
-    group = relationship("Group", back_populates="tasks", lazy="joined")
\ No newline at end of file
+    group = relationship("Group", back_populates="tasks", lazy="joined")
+
+    # keyset pagination of a group's tasks on (created_at, id), with or without filters
+    __table_args__ = (
+        Index("ix_tasks_group_created", "group_id", "created_at", "id"),
+        Index("ix_tasks_group_status_created", "group_id", "status", "created_at", "id"),
+        Index("ix_tasks_group_creator_created", "group_id", "creator_id", "created_at", "id"),
+        Index("ix_tasks_group_deadline", "group_id", "deadline"),
+        # candidates for archival: done tasks by age
+        Index("ix_tasks_status_updated", "status", "updated_at"),
+    )
+
+class GroupTaskCount(Base):
+    """Task counts per group, status and creator, kept in step with the tasks
+    table by the task mutation paths (app/core/stats.py)."""
+    __tablename__ = "group_task_counts"
+    group_id = Column(Integer, ForeignKey("groups.id"), primary_key=True)
+    status = Column(String, primary_key=True)
+    creator_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class RateLimitBucket(Base):
+    """Token buckets of the shared ("postgres") rate limit backend."""
+    __tablename__ = "rate_limit_buckets"
+    key = Column(String, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    # epoch seconds of the last hit
+    updated_at = Column(Float, nullable=False)
+    allowed = Column(Boolean, nullable=False)
+
+class ArchivedTask(Base):
+    """Finished tasks moved out of ``tasks`` by the archival job
+    (app/core/archive.py); same columns and ids, plus when it moved."""
+    __tablename__ = "tasks_archive"
+    id = Column(Integer, primary_key=True)
+    title = Column(String, nullable=False)
+    description = Column(Text, default="")
+    status = Column(String, default="todo")
+    deadline = Column(DateTime, nullable=True)
+    creator_id = Column(Integer, ForeignKey("users.id"))
+    group_id = Column(Integer, ForeignKey("groups.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    group = relationship("Group", lazy="joined", viewonly=True)
+
+    __table_args__ = (
+        Index("ix_tasks_archive_group_created", "group_id", "created_at", "id"),
+    )
+
+class Job(Base):
+    """Background job (app/core/jobs.py)."""
+    __tablename__ = "jobs"
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    # pending, running (leased until run_at) or failed
+    status = Column(String, nullable=False, default="pending")
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    # periodic jobs: a single row per kind, rescheduled every ``every`` seconds
+    unique_key = Column(String, unique=True, nullable=True)
+    every = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
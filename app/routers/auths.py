@@ -3,36 +3,59 @@ from sqlalchemy.orm import Session
 
 from app.schemas import LoginSchema, UserCreate, UserResponse, Token
 from app.models import User
-from app.database import get_db
-from app.core.security import hash_password, verify_password, create_access_token
-
-router = APIRouter(prefix="/auth", tags=["Auth"])
+from app.database import get_db, run_db
+from app.core.hashing import password_hasher
+from app.core.metrics import InstrumentedRoute
+from app.core.ratelimit import limit_by_ip, limiter
+from app.core.security import create_access_token, user_claims
+
+router = APIRouter(prefix="/auth", tags=["Auth"], route_class=InstrumentedRoute)
+
+# Handlers are async so bcrypt can be awaited on the hashing pool; the
+# database work runs through run_db.
+
+def _user_by_email(db: Session, email: str):
+    user = db.query(User).filter(User.email == email).first()
+    # hand the connection back to the pool before the slow hashing step;
+    # close() keeps the loaded attributes and the session stays usable
+    db.close()
+    return user
+
+def _save(db: Session, user: User):
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
 
-@router.post("/register", response_model=UserResponse)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == user_data.email).first()
+@router.post("/register", response_model=UserResponse, dependencies=[Depends(limit_by_ip("register:ip"))])
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+    existing = await run_db(db, _user_by_email, user_data.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     new_user = User(
         email=user_data.email,
         username=user_data.username,
-        hashed_password=hash_password(user_data.password)
+        hashed_password=await password_hasher.hash(user_data.password)
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    return await run_db(db, _save, new_user)
 
-    return new_user
-
-@router.post("/login", response_model=Token)
-def login(data: LoginSchema, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == data.email).first()
+@router.post("/login", response_model=Token, dependencies=[Depends(limit_by_ip("login:ip"))])
+async def login(data: LoginSchema, db: Session = Depends(get_db)):
+    # before the lookup and the bcrypt check
+    await limiter.hit("login:account", data.email.strip().lower())
+    user = await run_db(db, _user_by_email, data.email)
     if not user:
         raise HTTPException(status_code=400, detail="Email incorrect")
 
-    if not verify_password(data.password, user.hashed_password):
+    if not await password_hasher.verify(data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Mot de passe incorrect")
 
-    access_token = create_access_token({"sub": str(user.id)})
+    access_token = create_access_token(user_claims(user))
+
+    # transparently upgrade hashes made with another cost factor
+    if password_hasher.needs_rehash(user.hashed_password):
+        user.hashed_password = await password_hasher.hash(data.password)
+        await run_db(db, _save, user)
+
     return {"access_token": access_token, "token_type": "bearer"}
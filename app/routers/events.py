@@ -0,0 +1,70 @@
+# app/routers/events.py
+import asyncio
+import json
+import time
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from jose import jwt
+from sqlalchemy.orm import Session
+
+from app.core.authz import authorizer
+from app.core.config import settings
+from app.core.events import hub
+from app.core.metrics import InstrumentedRoute
+from app.core.security import get_current_user
+from app.database import get_db, run_db
+
+router = APIRouter(prefix="/groups", tags=["Events"], route_class=InstrumentedRoute)
+
+
+def _authorize(db: Session, token: str, group_id: int) -> int:
+    current_user = get_current_user(token, db)
+    try:
+        authorizer.require_member(db, current_user.id, group_id)
+    finally:
+        # the stream outlives the handler: don't keep a pooled connection
+        db.close()
+    return current_user.id
+
+
+@router.get("/{group_id}/events")
+async def group_events(group_id: int, token: str, db: Session = Depends(get_db)):
+    """Server-Sent Events stream of task and membership changes in a group.
+
+    EventSource cannot send headers, so the access token is a query parameter.
+    Access is checked when the stream opens; the stream then ends when the
+    token expires or the subscriber is removed from the group, and the
+    client's reconnection goes through the check again.
+    """
+    user_id = await run_db(db, _authorize, token, group_id)
+    # signature and expiry were verified by get_current_user
+    expires_at = jwt.get_unverified_claims(token).get("exp")
+    queue = hub.subscribe(group_id)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                timeout = settings.EVENTS_HEARTBEAT_SECONDS
+                if expires_at is not None:
+                    remaining = expires_at - time.time()
+                    if remaining <= 0:
+                        return
+                    timeout = min(timeout, remaining)
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"data: {json.dumps(message, default=str)}\n\n"
+                if message["type"] == "member.removed" and message["data"]["user_id"] == user_id:
+                    return
+        finally:
+            hub.unsubscribe(group_id, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
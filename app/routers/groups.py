@@ -1,30 +1,63 @@
 # app/routers/groups.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import update
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.database import dialect_insert, get_db, get_read_db
+from app.core import invites, replicas, stats
+from app.core.authz import authorizer
+from app.core.config import settings
+from app.core.etag import bump_group_version, check_etag, group_etag, make_etag
+from app.core.events import publish
+from app.core.fastjson import fast_response
+from app.core.pagination import keyset_page
+from app.core.readcache import read_cache, render
+from app.core.metrics import InstrumentedRoute
 from app.core.security import get_current_user
-from app.models import Group, GroupMember, Invite, User
-from app.schemas import GroupCreate, GroupResponse, GroupDetailResponse, MemberResponseSimple
+from app.models import Group, GroupMember, Invite, User, Task
+from app.routers.tasks import filtered_group_tasks
+from app.schemas import GroupCreate, GroupResponse, GroupDetailResponse, GroupDashboardResponse, GroupStatsResponse, MemberResponseSimple
+from datetime import date
 from uuid import uuid4
 
-router = APIRouter(prefix="/groups", tags=["Groups"])
+router = APIRouter(prefix="/groups", tags=["Groups"], route_class=InstrumentedRoute)
 
 @router.post("/", response_model=GroupResponse)
 def create_group(data: GroupCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    group = Group(name=data.name, owner_id=current_user.id)
+    # group and creator's admin membership: one flush (INSERT ... RETURNING
+    # for the group id), one commit, never a group without its admin
+    group = Group(
+        name=data.name,
+        owner_id=current_user.id,
+        members=[GroupMember(user_id=current_user.id, role="admin")],
+    )
     db.add(group)
+    db.flush()
+    created = {"name": group.name, "id": group.id, "owner_id": group.owner_id}
     db.commit()
-    db.refresh(group)
-
-    # add creator as admin member
-    membership = GroupMember(user_id=current_user.id, group_id=group.id, role="admin")
-    db.add(membership)
-    db.commit()
-
-    return group
+    return created
 
 @router.get("/", response_model=list[GroupResponse])
-def list_groups(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def list_groups(request: Request, response: Response, db: Session = Depends(get_read_db), current_user=Depends(get_current_user)):
+    versions = (
+        db.query(Group.id, Group.version)
+        .join(GroupMember, GroupMember.group_id == Group.id)
+        .filter(GroupMember.user_id == current_user.id)
+        .order_by(Group.id)
+        .all()
+    )
+    not_modified = check_etag(request, response, make_etag("groups", current_user.id, [tuple(v) for v in versions]))
+    if not_modified:
+        return not_modified
+
+    if settings.FAST_JSON:
+        rows = (
+            db.query(Group.name, Group.id, Group.owner_id)
+            .join(GroupMember, GroupMember.group_id == Group.id)
+            .filter(GroupMember.user_id == current_user.id)
+        )
+        return fast_response([row._asdict() for row in rows], response)
+
     groups = (
         db.query(Group)
         .join(GroupMember, GroupMember.group_id == Group.id)
@@ -33,114 +66,168 @@ def list_groups(db: Session = Depends(get_db), current_user=Depends(get_current_
     )
     return groups
 
-@router.get("/{group_id}", response_model=GroupDetailResponse)
-def get_group(group_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    group = db.query(Group).filter(Group.id == group_id).first()
+def member_dict(gm: GroupMember, u: User) -> dict:
+    return {
+        "id": gm.id,
+        "user_id": u.id,
+        "username": u.username,
+        "email": u.email,
+        "role": gm.role
+    }
+
+def load_group_with_members(db: Session, group_id: int) -> Group:
+    """Group plus members and their users in a fixed number of queries (2)."""
+    group = (
+        db.query(Group)
+        .options(selectinload(Group.members).joinedload(GroupMember.user))
+        .filter(Group.id == group_id)
+        .first()
+    )
     if not group:
         raise HTTPException(404, "Groupe introuvable")
+    return group
 
-    # load members
-    members_q = (
-        db.query(GroupMember, User)
-        .join(User, GroupMember.user_id == User.id)
-        .filter(GroupMember.group_id == group_id)
-        .all()
-    )
-
-    members = []
-    for gm, u in members_q:
-        members.append({
-            "id": gm.id,
-            "user_id": u.id,
-            "username": u.username,
-            "email": u.email,
-            "role": gm.role
+@router.get("/{group_id}", response_model=GroupDetailResponse)
+def get_group(group_id: int, request: Request, response: Response, db: Session = Depends(get_read_db), current_user=Depends(get_current_user)):
+    authorizer.require_member(db, current_user.id, group_id)
+    etag = group_etag(db, group_id, "detail")
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    def load():
+        group = load_group_with_members(db, group_id)
+        return render(GroupDetailResponse, {
+            "id": group.id,
+            "name": group.name,
+            "owner_id": group.owner_id,
+            "members": [member_dict(gm, gm.user) for gm in group.members],
         })
 
-    return GroupDetailResponse(
-        id=group.id,
-        name=group.name,
-        owner_id=group.owner_id,
-        members=members
-    )
+    return read_cache.respond("detail", group_id, etag, response, load)
 
 @router.get("/{group_id}/members", response_model=list[MemberResponseSimple])
-def list_group_members(group_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    members_q = (
-        db.query(GroupMember, User)
-        .join(User, GroupMember.user_id == User.id)
-        .filter(GroupMember.group_id == group_id)
-        .all()
-    )
-    members = []
-    for gm, u in members_q:
-        members.append({
-            "id": gm.id,
-            "user_id": u.id,
-            "username": u.username,
-            "email": u.email,
-            "role": gm.role
+def list_group_members(group_id: int, request: Request, response: Response, db: Session = Depends(get_read_db), current_user=Depends(get_current_user)):
+    authorizer.require_member(db, current_user.id, group_id)
+    etag = group_etag(db, group_id, "members")
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    def load():
+        members_q = (
+            db.query(GroupMember, User)
+            .join(User, GroupMember.user_id == User.id)
+            .filter(GroupMember.group_id == group_id)
+            .all()
+        )
+        return render(list[MemberResponseSimple], [member_dict(gm, u) for gm, u in members_q])
+
+    return read_cache.respond("members", group_id, etag, response, load)
+
+@router.get("/{group_id}/dashboard", response_model=GroupDashboardResponse)
+def get_group_dashboard(group_id: int, request: Request, response: Response, db: Session = Depends(get_read_db), current_user=Depends(get_current_user)):
+    """Everything the group page needs in one call: group, members, task
+    counts per status and the first page of tasks (a fixed 4 queries, plus
+    the version lookup for the ETag)."""
+    authorizer.require_member(db, current_user.id, group_id)
+    etag = group_etag(db, group_id, "dashboard")
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    def load():
+        group = load_group_with_members(db, group_id)
+
+        task_counts = stats.status_counts(db, group_id)
+        tasks, next_cursor = keyset_page(
+            filtered_group_tasks(db, group_id), Task.created_at, Task.id, settings.TASK_PAGE_SIZE
+        )
+        for task in tasks:
+            set_committed_value(task, "group", group)
+
+        return render(GroupDashboardResponse, {
+            "id": group.id,
+            "name": group.name,
+            "owner_id": group.owner_id,
+            "members": [member_dict(gm, gm.user) for gm in group.members],
+            "task_counts": task_counts,
+            "tasks": {"items": tasks, "next_cursor": next_cursor},
         })
-    return members
+
+    return read_cache.respond("dashboard", group_id, etag, response, load)
+
+@router.get("/{group_id}/stats", response_model=GroupStatsResponse)
+def get_group_stats(group_id: int, request: Request, response: Response, db: Session = Depends(get_read_db), current_user=Depends(get_current_user)):
+    """Task counts per status and creator, read from the maintained counters,
+    plus the number of unfinished tasks past their deadline."""
+    authorizer.require_member(db, current_user.id, group_id)
+    # "overdue" moves with the date even when nothing is written
+    today = date.today()
+    not_modified = check_etag(request, response, group_etag(db, group_id, "stats", today))
+    if not_modified:
+        return not_modified
+
+    return stats.group_stats(db, group_id, today)
 
 @router.delete("/{group_id}/members/{user_id}")
 def remove_member(group_id: int, user_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    group = db.query(Group).filter(Group.id == group_id).first()
-    if not group:
-        raise HTTPException(404, "Groupe introuvable")
-
     # only owner or admin can remove
-    if group.owner_id != current_user.id:
-        admin_membership = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id, GroupMember.user_id == current_user.id, GroupMember.role == "admin"
-        ).first()
-        if not admin_membership:
-            raise HTTPException(403, "Seul le propriétaire ou un admin peut retirer un membre")
+    authorizer.require_manager(db, current_user.id, group_id, "Seul le propriétaire ou un admin peut retirer un membre")
 
     membership = db.query(GroupMember).filter(GroupMember.group_id == group_id, GroupMember.user_id == user_id).first()
     if not membership:
         raise HTTPException(404, "Membre non trouvé")
 
     db.delete(membership)
+    publish(db, group_id, "member.removed", {"user_id": user_id})
+    bump_group_version(db, group_id)
     db.commit()
+    authorizer.invalidate(group_id, user_id)
     return {"message": "Membre retiré"}
 
 @router.post("/{group_id}/invite")
 def generate_invite(group_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    group = db.query(Group).filter(Group.id == group_id).first()
-    if not group:
-        raise HTTPException(404, "Groupe introuvable")
-
     # only owner or admin can create invite
-    if group.owner_id != current_user.id:
-        admin_membership = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id, GroupMember.user_id == current_user.id, GroupMember.role == "admin"
-        ).first()
-        if not admin_membership:
-            raise HTTPException(403, "Seul le propriétaire ou un admin peut inviter")
+    authorizer.require_manager(db, current_user.id, group_id, "Seul le propriétaire ou un admin peut inviter")
 
     token = uuid4().hex
-    invite = Invite(group_id=group_id, token=token)
+    invite = Invite(group_id=group_id, token=token, expires_at=invites.expiry())
     db.add(invite)
     db.commit()
 
     return {"invite_link": f"http://127.0.0.1:8000/groups/join/{token}", "token": token}
 
 @router.get("/join/{token}")
-def join_group(token: str, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    invite = db.query(Invite).filter(Invite.token == token, Invite.used == False).first()
-    if not invite:
-        raise HTTPException(400, "Invitation invalide ou utilisée")
-
-    # if already member, just return
-    existing = db.query(GroupMember).filter(GroupMember.group_id == invite.group_id, GroupMember.user_id == current_user.id).first()
-    if existing:
+def join_group(token: str, response: Response, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    # claim the invite atomically: of concurrent joins with one token, only
+    # one sees it live (the others wait on the row lock, then match nothing)
+    group_id = db.execute(
+        update(Invite)
+        .where(Invite.token == token, invites.is_live())
+        .values(used=True)
+        .returning(Invite.group_id)
+    ).scalar()
+    if group_id is None:
+        raise HTTPException(400, "Invitation invalide, expirée ou utilisée")
+
+    membership_id = db.execute(
+        dialect_insert(db, GroupMember)
+        .values(user_id=current_user.id, group_id=group_id, role="member")
+        .on_conflict_do_nothing(index_elements=["group_id", "user_id"])
+        .returning(GroupMember.id)
+    ).scalar()
+    if membership_id is None:
+        # already a member: leave the invite unused
+        db.rollback()
         return {"message": "Déjà membre"}
 
-    membership = GroupMember(user_id=current_user.id, group_id=invite.group_id, role="member")
-    db.add(membership)
-    # mark invite used
-    invite.used = True
+    membership = GroupMember(id=membership_id, user_id=current_user.id, group_id=group_id, role="member")
+    publish(db, group_id, "member.joined", member_dict(membership, current_user))
+    bump_group_version(db, group_id)
     db.commit()
+    authorizer.invalidate(group_id, current_user.id)
+    # a GET that writes: the middleware does not see it as a mutation
+    replicas.stick(response)
 
     return {"message": "Ajouté au groupe"}
@@ -1,19 +1,51 @@
 # app/routers/tasks.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
+import csv
+import html
+import io
+import json
+from collections import namedtuple
+from datetime import date, datetime, time
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, cast, delete, func, insert, literal_column, or_, select, union_all, update
+from sqlalchemy.orm import Session, lazyload
+from app.database import get_db, get_read_db, engine, async_engine
+from app.core import stats
+from app.core.authz import MANAGERS, authorizer
+from app.core.config import settings
+from app.core.etag import bump_group_version, check_etag, group_etag
+from app.core.events import publish
+from app.core.fastjson import dumps
+from app.core.pagination import keyset_page, merge_keyset_pages
+from app.core.readcache import read_cache, render
+from app.core.metrics import InstrumentedRoute
 from app.core.security import get_current_user
-from app.models import Task, Group
-from app.schemas import TaskCreate, TaskUpdate, TaskResponse
+from app.models import ArchivedTask, Task, Group, GroupMember
+from app.schemas import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskPage, TaskSearchPage,
+    TaskBulkUpdate, TaskBulkDelete, BulkResult,
+)
 
-router = APIRouter(prefix="/tasks", tags=["Tasks"])
+router = APIRouter(prefix="/tasks", tags=["Tasks"], route_class=InstrumentedRoute)
+
+def task_dict(task: Task) -> dict:
+    """JSON-ready TaskResponse fields, without the nested group."""
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status,
+        # the column is a DateTime but the API exposes a date
+        "deadline": task.deadline.isoformat()[:10] if task.deadline else None,
+        "group_id": task.group_id,
+        "created_at": task.created_at.isoformat(),
+    }
 
 @router.post("/", response_model=TaskResponse)
 def create_task(data: TaskCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
     if data.group_id is not None:
-        group = db.query(Group).filter(Group.id == data.group_id).first()
-        if not group:
-            raise HTTPException(404, "Groupe introuvable")
+        authorizer.require_member(db, current_user.id, data.group_id)
 
     task = Task(
         title=data.title,
@@ -24,14 +56,270 @@ def create_task(data: TaskCreate, db: Session = Depends(get_db), current_user=De
         creator_id=current_user.id
     )
     db.add(task)
+    db.flush()
+    publish(db, task.group_id, "task.created", task_dict(task))
+    bump_group_version(db, data.group_id)
+    counts = stats.TaskCounts()
+    counts.add(task.group_id, task.status, task.creator_id)
+    stats.apply(db, counts)
     db.commit()
     db.refresh(task)
     return task
 
-@router.get("/group/{group_id}", response_model=list[TaskResponse])
-def list_group_tasks(group_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    tasks = db.query(Task).filter(Task.group_id == group_id).all()
-    return tasks
+# TaskResponse fields, for the FAST_JSON path
+TASK_COLUMNS = (Task.title, Task.description, Task.deadline, Task.status, Task.id, Task.group_id, Task.created_at)
+
+def task_rows(rows, group: dict) -> list[dict]:
+    """TaskResponse-shaped dicts from TASK_COLUMNS rows of one group; every
+    task shares the same ``group`` dict."""
+    return [
+        {
+            "title": title,
+            "description": description,
+            "deadline": deadline.date() if deadline else None,
+            "status": status,
+            "id": task_id,
+            "group_id": group_id,
+            "group": group,
+            "created_at": created_at,
+        }
+        for title, description, deadline, status, task_id, group_id, created_at in rows
+    ]
+
+def filtered_group_tasks(
+    db: Session,
+    group_id: int,
+    status: Optional[str] = None,
+    creator_id: Optional[int] = None,
+    deadline_from: Optional[date] = None,
+    deadline_to: Optional[date] = None,
+    columns=None,
+    model=Task,
+):
+    """``model`` is Task or ArchivedTask; ``columns`` are Task columns, taken
+    by name from ``model``."""
+    if columns is None:
+        # the group is the same for every row: load it lazily once (identity
+        # map) instead of joining it onto each task
+        query = db.query(model).options(lazyload(model.group))
+    else:
+        query = db.query(*(getattr(model, column.key) for column in columns))
+    query = query.filter(model.group_id == group_id)
+    if status is not None:
+        query = query.filter(model.status == status)
+    if creator_id is not None:
+        query = query.filter(model.creator_id == creator_id)
+    if deadline_from is not None:
+        query = query.filter(model.deadline >= datetime.combine(deadline_from, time.min))
+    if deadline_to is not None:
+        query = query.filter(model.deadline <= datetime.combine(deadline_to, time.max))
+    return query
+
+def group_tasks_page(db: Session, group_id: int, filters: tuple, limit: int, cursor, include_archived: bool, columns=None):
+    """One keyset page of a group's tasks, merged with the archived ones
+    (same ids, same ordering) when ``include_archived``."""
+    models = (Task, ArchivedTask) if include_archived else (Task,)
+    pages = [
+        keyset_page(
+            filtered_group_tasks(db, group_id, *filters, columns=columns, model=model),
+            model.created_at, model.id, limit, cursor,
+        )
+        for model in models
+    ]
+    if len(pages) == 1:
+        return pages[0]
+    return merge_keyset_pages(pages, "created_at", "id", limit)
+
+@router.get("/group/{group_id}", response_model=TaskPage)
+def list_group_tasks(
+    group_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.TASK_PAGE_SIZE, ge=1, le=settings.TASK_PAGE_MAX_SIZE),
+    status: Optional[str] = None,
+    creator_id: Optional[int] = None,
+    deadline_from: Optional[date] = None,
+    deadline_to: Optional[date] = None,
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    authorizer.require_member(db, current_user.id, group_id)
+    filters = (status, creator_id, deadline_from, deadline_to)
+    # the parsed parameters, not the raw query string: unknown or reordered
+    # parameters must not mint new ETags (and read cache keys)
+    etag = group_etag(db, group_id, "tasks", filters, limit, cursor, include_archived)
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+
+    def load():
+        if settings.FAST_JSON:
+            rows, next_cursor = group_tasks_page(db, group_id, filters, limit, cursor, include_archived, TASK_COLUMNS)
+            group = db.query(Group.name, Group.id, Group.owner_id).filter(Group.id == group_id).one()._asdict()
+            return dumps({"items": task_rows(rows, group), "next_cursor": next_cursor})
+
+        tasks, next_cursor = group_tasks_page(db, group_id, filters, limit, cursor, include_archived)
+        return render(TaskPage, {"items": tasks, "next_cursor": next_cursor})
+
+    return read_cache.respond("tasks", group_id, etag, response, load)
+
+# -----------------------------
+# SEARCH
+# On PostgreSQL, matches go through the GIN index on the generated
+# tasks.search_vector column (see the migration) and only the returned page
+# is ranked into highlights. Other databases get a plain LIKE match.
+# -----------------------------
+SEARCH_CONFIG = "french"
+# ts_headline marks matches with private-use sentinels; the text is
+# HTML-escaped afterwards and only then are the sentinels turned into <mark>
+MARK_START, MARK_STOP = "\ue000", "\ue001"
+HEADLINE_OPTIONS = f"StartSel={MARK_START}, StopSel={MARK_STOP}, MaxWords=35, MinWords=15, MaxFragments=2"
+
+def _highlight(text: str) -> str:
+    """HTML-safe highlight: escaped text, matches wrapped in <mark>."""
+    return html.escape(text).replace(MARK_START, "<mark>").replace(MARK_STOP, "</mark>")
+
+def _search_scope(user_id: int):
+    """Tasks of the caller's groups, plus their own tasks outside any group."""
+    member_groups = select(GroupMember.group_id).where(GroupMember.user_id == user_id)
+    return or_(Task.group_id.in_(member_groups), and_(Task.group_id.is_(None), Task.creator_id == user_id))
+
+def _search_postgres(db: Session, q: str, user_id: int, limit: int, offset: int) -> list:
+    from sqlalchemy.dialects.postgresql import REGCONFIG
+
+    config = cast(SEARCH_CONFIG, REGCONFIG)
+    tsquery = func.websearch_to_tsquery(config, q)
+    vector = literal_column("tasks.search_vector")
+    rank = func.ts_rank_cd(vector, tsquery)
+    hits = (
+        select(Task.id, rank.label("rank"))
+        .where(vector.op("@@")(tsquery), _search_scope(user_id))
+        .order_by(rank.desc(), Task.id)
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    rows = db.execute(
+        select(
+            Task,
+            hits.c.rank,
+            func.ts_headline(config, Task.title, tsquery, HEADLINE_OPTIONS),
+            func.ts_headline(config, func.coalesce(Task.description, ""), tsquery, HEADLINE_OPTIONS),
+        )
+        .join(hits, hits.c.id == Task.id)
+        .order_by(hits.c.rank.desc(), Task.id)
+    )
+    return [
+        {"task": task, "rank": score, "highlights": {"title": _highlight(title), "description": _highlight(description)}}
+        for task, score, title, description in rows
+    ]
+
+def _search_like(db: Session, q: str, user_id: int, limit: int, offset: int) -> list:
+    tasks = db.scalars(
+        select(Task)
+        .where(or_(Task.title.icontains(q, autoescape=True), Task.description.icontains(q, autoescape=True)), _search_scope(user_id))
+        .order_by(Task.created_at.desc(), Task.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return [
+        {"task": task, "rank": 0.0, "highlights": {"title": html.escape(task.title), "description": html.escape(task.description or "")}}
+        for task in tasks
+    ]
+
+@router.get("/search", response_model=TaskSearchPage)
+def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(settings.TASK_PAGE_SIZE, ge=1, le=settings.TASK_PAGE_MAX_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    search = _search_postgres if db.get_bind().dialect.name == "postgresql" else _search_like
+    # one extra row tells whether there is a next page
+    items = search(db, q, current_user.id, limit + 1, offset)
+    next_offset = offset + limit if len(items) > limit else None
+    return {"items": items[:limit], "next_offset": next_offset}
+
+# -----------------------------
+# EXPORT
+# Rows are streamed from a server-side cursor as plain column tuples (no ORM
+# entities, no joined group), so memory stays flat whatever the group size.
+# -----------------------------
+EXPORT_COLUMNS = (
+    Task.id, Task.title, Task.description, Task.status, Task.deadline,
+    Task.creator_id, Task.group_id, Task.created_at, Task.updated_at,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _ndjson_chunk(rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_export_value, row))), ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+def _csv_chunk(rows, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows([map(_export_value, row) for row in rows])
+    return buffer.getvalue()
+
+def _export_statement(group_id: int, include_archived: bool = False):
+    if not include_archived:
+        return select(*EXPORT_COLUMNS).where(Task.group_id == group_id).order_by(Task.created_at, Task.id)
+    both = union_all(*(
+        select(*(getattr(model, field) for field in EXPORT_FIELDS)).where(model.group_id == group_id)
+        for model in (Task, ArchivedTask)
+    ))
+    return both.order_by(both.selected_columns.created_at, both.selected_columns.id)
+
+def _stream_export(group_id: int, fmt: str, include_archived: bool):
+    if fmt == "csv":
+        yield _csv_chunk([], header=True)
+    with engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=settings.TASK_EXPORT_BATCH_SIZE
+        ).execute(_export_statement(group_id, include_archived))
+        for rows in result.partitions():
+            yield _csv_chunk(rows) if fmt == "csv" else _ndjson_chunk(rows)
+
+async def _stream_export_async(group_id: int, fmt: str, include_archived: bool):
+    if fmt == "csv":
+        yield _csv_chunk([], header=True)
+    async with async_engine.connect() as conn:
+        result = await conn.stream(
+            _export_statement(group_id, include_archived).execution_options(yield_per=settings.TASK_EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            yield _csv_chunk(rows) if fmt == "csv" else _ndjson_chunk(rows)
+
+@router.get("/group/{group_id}/export")
+def export_group_tasks(
+    group_id: int,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    include_archived: bool = False,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    authorizer.require_member(db, current_user.id, group_id)
+    # the stream outlives the handler: don't keep a pooled connection
+    db.close()
+
+    stream = _stream_export_async if async_engine is not None else _stream_export
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream(group_id, fmt, include_archived),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="group-{group_id}-tasks.{fmt}"'},
+    )
 
 @router.put("/{task_id}", response_model=TaskResponse)
 def update_task(task_id: int, data: TaskUpdate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
@@ -39,14 +327,31 @@ def update_task(task_id: int, data: TaskUpdate, db: Session = Depends(get_db), c
     if not task:
         raise HTTPException(404, "Tâche introuvable")
 
-    # only creator or group admin/owner could update in production; here we allow creator
-    if task.creator_id != current_user.id:
-        # optional: allow group owner/admin (not implemented fully)
-        pass
+    # only the creator or a group owner/admin, and only into a group the user belongs to
+    changes = data.dict(exclude_unset=True)
+    roles = authorizer.roles(db, current_user.id, [task.group_id, changes.get("group_id")])
+    if not _can_write(task, roles, current_user.id) or (
+        changes.get("group_id") is not None and roles.get(changes["group_id"]) is None
+    ):
+        raise HTTPException(403, "Accès refusé")
 
-    for key, value in data.dict(exclude_unset=True).items():
+    old_group_id, old_status = task.group_id, task.status
+    for key, value in changes.items():
         setattr(task, key, value)
 
+    db.flush()
+    # the previous status lets clients move their per-status counts even
+    # when the task is not on a page they have loaded
+    if old_group_id == task.group_id:
+        publish(db, task.group_id, "task.updated", {**task_dict(task), "previous_status": old_status})
+    else:
+        publish(db, old_group_id, "task.deleted", {"id": task.id, "status": old_status})
+        publish(db, task.group_id, "task.created", task_dict(task))
+    bump_group_version(db, old_group_id, task.group_id)
+    counts = stats.TaskCounts()
+    counts.remove(old_group_id, old_status, task.creator_id)
+    counts.add(task.group_id, task.status, task.creator_id)
+    stats.apply(db, counts)
     db.commit()
     db.refresh(task)
     return task
@@ -57,6 +362,145 @@ def delete_task(task_id: int, db: Session = Depends(get_db), current_user=Depend
     if not task:
         raise HTTPException(404, "Tâche introuvable")
 
+    roles = authorizer.roles(db, current_user.id, [task.group_id])
+    if not _can_write(task, roles, current_user.id):
+        raise HTTPException(403, "Accès refusé")
+
     db.delete(task)
+    publish(db, task.group_id, "task.deleted", {"id": task.id, "status": task.status})
+    bump_group_version(db, task.group_id)
+    counts = stats.TaskCounts()
+    counts.remove(task.group_id, task.status, task.creator_id)
+    stats.apply(db, counts)
     db.commit()
     return {"message": "Tâche supprimée"}
+
+
+# -----------------------------
+# BULK OPERATIONS
+# Each call is one transaction: membership is resolved once per batch, rows
+# go through multi-row INSERT ... RETURNING / UPDATE by primary key / a
+# single DELETE, and the outcome is reported per item.
+# -----------------------------
+def _check_batch_size(items: list):
+    if len(items) > settings.TASK_BULK_MAX_ITEMS:
+        raise HTTPException(413, f"Au plus {settings.TASK_BULK_MAX_ITEMS} éléments par lot")
+
+TaskRef = namedtuple("TaskRef", "id group_id creator_id status")
+
+def _load_tasks(db: Session, ids) -> dict[int, TaskRef]:
+    rows = db.execute(select(Task.id, Task.group_id, Task.creator_id, Task.status).where(Task.id.in_(set(ids))))
+    return {row.id: TaskRef(*row) for row in rows}
+
+def _can_write(task, roles: dict[int, str | None], user_id: int) -> bool:
+    """Creator or group owner/admin; tasks outside a group belong to their creator."""
+    if task.group_id is None:
+        return task.creator_id == user_id
+    role = roles.get(task.group_id)
+    return role is not None and (task.creator_id == user_id or role in MANAGERS)
+
+@router.post("/bulk/create", response_model=BulkResult)
+def bulk_create_tasks(data: list[TaskCreate], db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    _check_batch_size(data)
+    roles = authorizer.roles(db, current_user.id, [item.group_id for item in data])
+
+    results, rows = [], []
+    for index, item in enumerate(data):
+        if item.group_id is not None and roles.get(item.group_id) is None:
+            results.append({"index": index, "ok": False, "detail": "Groupe introuvable ou non membre"})
+            continue
+        rows.append((index, {
+            "title": item.title,
+            "description": item.description or "",
+            "status": item.status or "todo",
+            "deadline": item.deadline,
+            "group_id": item.group_id,
+            "creator_id": current_user.id,
+        }))
+
+    if rows:
+        created = db.scalars(insert(Task).returning(Task, sort_by_parameter_order=True), [row for _, row in rows]).all()
+        counts = stats.TaskCounts()
+        for (index, _), task in zip(rows, created):
+            results.append({"index": index, "ok": True, "id": task.id})
+            publish(db, task.group_id, "task.created", task_dict(task))
+            counts.add(task.group_id, task.status, task.creator_id)
+        bump_group_version(db, *{row["group_id"] for _, row in rows})
+        stats.apply(db, counts)
+    db.commit()
+
+    return {"results": sorted(results, key=lambda r: r["index"])}
+
+@router.post("/bulk/update", response_model=BulkResult)
+def bulk_update_tasks(data: list[TaskBulkUpdate], db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    _check_batch_size(data)
+    existing = _load_tasks(db, (item.id for item in data))
+    roles = authorizer.roles(
+        db, current_user.id,
+        [row.group_id for row in existing.values()] + [item.group_id for item in data],
+    )
+
+    results, params, touched_groups = [], [], set()
+    previous_status = {task_id: row.status for task_id, row in existing.items()}
+    counts = stats.TaskCounts()
+    now = datetime.utcnow()
+    for index, item in enumerate(data):
+        row = existing.get(item.id)
+        changes = item.dict(exclude_unset=True, exclude={"id"})
+        if row is None:
+            results.append({"index": index, "ok": False, "id": item.id, "detail": "Tâche introuvable"})
+        elif not _can_write(row, roles, current_user.id) or (
+            changes.get("group_id") is not None and roles.get(changes["group_id"]) is None
+        ):
+            results.append({"index": index, "ok": False, "id": item.id, "detail": "Accès refusé"})
+        else:
+            params.append({"id": item.id, **changes, "updated_at": now})
+            # later items for the same task start from this state
+            new = existing[item.id] = row._replace(
+                group_id=changes.get("group_id", row.group_id), status=changes.get("status", row.status)
+            )
+            touched_groups.update({row.group_id, new.group_id})
+            counts.remove(row.group_id, row.status, row.creator_id)
+            counts.add(new.group_id, new.status, new.creator_id)
+            results.append({"index": index, "ok": True, "id": item.id})
+
+    if params:
+        # executemany UPDATE ... WHERE id = :id, batched per set of columns
+        db.execute(update(Task), params)
+        for task in db.scalars(select(Task).options(lazyload(Task.group)).where(Task.id.in_({p["id"] for p in params}))):
+            publish(db, task.group_id, "task.updated", {**task_dict(task), "previous_status": previous_status[task.id]})
+        bump_group_version(db, *touched_groups)
+        stats.apply(db, counts)
+    db.commit()
+
+    return {"results": results}
+
+@router.post("/bulk/delete", response_model=BulkResult)
+def bulk_delete_tasks(data: TaskBulkDelete, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    _check_batch_size(data.ids)
+    existing = _load_tasks(db, data.ids)
+    roles = authorizer.roles(db, current_user.id, [row.group_id for row in existing.values()])
+
+    results, allowed, statuses = [], {}, {}
+    counts = stats.TaskCounts()
+    for index, task_id in enumerate(data.ids):
+        row = existing.get(task_id)
+        if row is None:
+            results.append({"index": index, "ok": False, "id": task_id, "detail": "Tâche introuvable"})
+        elif not _can_write(row, roles, current_user.id):
+            results.append({"index": index, "ok": False, "id": task_id, "detail": "Accès refusé"})
+        else:
+            if task_id not in allowed:
+                counts.remove(row.group_id, row.status, row.creator_id)
+            allowed[task_id], statuses[task_id] = row.group_id, row.status
+            results.append({"index": index, "ok": True, "id": task_id})
+
+    if allowed:
+        db.execute(delete(Task).where(Task.id.in_(allowed)), execution_options={"synchronize_session": False})
+        for task_id, group_id in allowed.items():
+            publish(db, group_id, "task.deleted", {"id": task_id, "status": statuses[task_id]})
+        bump_group_version(db, *allowed.values())
+        stats.apply(db, counts)
+    db.commit()
+
+    return {"results": results}
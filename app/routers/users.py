@@ -1,18 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, or_, select, tuple_
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import User
+from app.database import get_read_db
+from app.core.config import settings
+from app.core.fastjson import fast_response
+from app.core.pagination import decode_sort_cursor, encode_sort_cursor
+from app.models import GroupMember, User
+from app.core.metrics import InstrumentedRoute
 from app.core.security import get_current_user
-from app.schemas import UserResponse
+from app.schemas import UserPage, UserResponse
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=InstrumentedRoute)
 
-@router.get("/", response_model=list[UserResponse])
-def list_users(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    return db.query(User).all()
+def _directory_scope(user_id: int):
+    """Users sharing at least one group with ``user_id`` (themselves included)."""
+    my_groups = select(GroupMember.group_id).where(GroupMember.user_id == user_id)
+    return User.id.in_(select(GroupMember.user_id).where(GroupMember.group_id.in_(my_groups)))
+
+@router.get("/", response_model=UserPage)
+def list_users(
+    q: Optional[str] = Query(None, max_length=100, description="prefix of the username or email"),
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.USER_PAGE_SIZE, ge=1, le=settings.USER_PAGE_MAX_SIZE),
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user),
+):
+    # directory of the caller's co-members, by name, keyset-paged; with ``q``
+    # the same listing narrowed to a prefix (typeahead)
+    sort_key = func.lower(User.username)
+    query = select(User.email, User.id, User.username, sort_key.label("sort_key")).where(_directory_scope(current_user.id))
+    prefix = (q or "").strip().lower()
+    if prefix:
+        query = query.where(or_(
+            sort_key.startswith(prefix, autoescape=True),
+            func.lower(User.email).startswith(prefix, autoescape=True),
+        ))
+    if cursor:
+        query = query.where(tuple_(sort_key, User.id) > decode_sort_cursor(cursor))
+    rows = db.execute(query.order_by(sort_key, User.id).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_sort_cursor(rows[-1].sort_key, rows[-1].id)
+    items = [{"email": row.email, "id": row.id, "username": row.username} for row in rows]
+    if settings.FAST_JSON:
+        return fast_response({"items": items, "next_cursor": next_cursor})
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+def get_user(user_id: int, db: Session = Depends(get_read_db), current_user = Depends(get_current_user)):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(404, "Utilisateur non trouvé")
@@ -1,5 +1,5 @@
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import BaseModel, EmailStr
 
 # -----------------------------
@@ -20,6 +20,10 @@ class UserResponse(UserBase):
     class Config:
         orm_mode = True
 
+class UserPage(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
+
 # -----------------------------
 # AUTH SCHEMAS
 # -----------------------------
@@ -115,3 +119,47 @@ class TaskResponse(TaskBase):
 
     class Config:
         from_attributes = True
+
+class TaskBulkUpdate(TaskUpdate):
+    id: int
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int]
+
+class BulkItemResult(BaseModel):
+    index: int
+    ok: bool
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+class BulkResult(BaseModel):
+    results: List[BulkItemResult]
+
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = None
+
+class TaskSearchHit(BaseModel):
+    task: TaskResponse
+    rank: float
+    # HTML: the text is escaped, matched terms are wrapped in <mark>
+    highlights: Dict[str, str]
+
+class TaskSearchPage(BaseModel):
+    items: List[TaskSearchHit]
+    next_offset: Optional[int] = None
+
+# -----------------------------
+# DASHBOARD
+# -----------------------------
+class GroupStatsResponse(BaseModel):
+    group_id: int
+    total: int
+    by_status: Dict[str, int]
+    # task counts per creator (tasks have no assignee)
+    by_creator: Dict[int, int]
+    overdue: int
+
+class GroupDashboardResponse(GroupDetailResponse):
+    task_counts: Dict[str, int] = {}
+    tasks: TaskPage
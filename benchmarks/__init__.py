@@ -0,0 +1,6 @@
+"""In-process benchmarks for the API.
+
+Each module is runnable with ``python -m benchmarks.<name>``; they drive the
+real ASGI app through httpx against a throwaway SQLite database unless
+``DATABASE_URL`` is already set.
+"""
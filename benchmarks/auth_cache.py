@@ -0,0 +1,44 @@
+"""Requests/sec of a protected route with and without the principal cache.
+
+    python -m benchmarks.auth_cache [--requests N] [--concurrency C]
+"""
+import argparse
+import asyncio
+
+from benchmarks.common import client, login, print_table, reset_db, run_load
+from app.core.config import settings
+from app.core.security import principal_cache
+
+
+async def main(requests: int, concurrency: int):
+    reset_db()
+    async with client() as c:
+        headers = await login(c, "bench@example.com")
+        r = await c.post("/groups/", json={"name": "bench"}, headers=headers)
+        group_id = r.json()["id"]
+        # a route whose own work is a single indexed query, so auth dominates
+        request = lambda: c.get(f"/tasks/group/{group_id}?limit=1", headers=headers)
+
+        results = {}
+        cache_size = principal_cache.maxsize
+
+        principal_cache.maxsize = 0
+        principal_cache.clear()
+        results["no cache (db lookup)"] = await run_load(request, requests, concurrency)
+
+        principal_cache.maxsize = cache_size
+        results["principal cache"] = await run_load(request, requests, concurrency)
+
+        settings.AUTH_CLAIMS_ONLY = True
+        results["claims-only"] = await run_load(request, requests, concurrency)
+        settings.AUTH_CLAIMS_ONLY = False
+
+    print_table(f"GET /tasks/group/{{id}} ({requests} requests, {concurrency} clients)", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
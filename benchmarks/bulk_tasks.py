@@ -0,0 +1,74 @@
+"""Task throughput of the per-item endpoints vs the /tasks/bulk endpoints.
+
+    python -m benchmarks.bulk_tasks [--tasks N] [--batch B]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import client, login, reset_db
+
+
+async def timed(coro) -> float:
+    start = time.perf_counter()
+    await coro
+    return time.perf_counter() - start
+
+
+async def main(n: int, batch: int):
+    reset_db()
+    results = {}
+    async with client() as c:
+        headers = await login(c, "bench@example.com")
+        group_id = (await c.post("/groups/", json={"name": "bench"}, headers=headers)).json()["id"]
+
+        # per-item endpoints, one request (and one commit) per task
+        ids = []
+
+        async def create_each():
+            for i in range(n):
+                r = await c.post("/tasks/", json={"title": f"task {i}", "group_id": group_id}, headers=headers)
+                ids.append(r.json()["id"])
+
+        async def update_each():
+            for task_id in ids:
+                await c.put(f"/tasks/{task_id}", json={"status": "done"}, headers=headers)
+
+        async def delete_each():
+            for task_id in ids:
+                await c.delete(f"/tasks/{task_id}", headers=headers)
+
+        results["per-item"] = [await timed(create_each()), await timed(update_each()), await timed(delete_each())]
+
+        # bulk endpoints, one transaction per batch
+        ids = []
+
+        async def create_bulk():
+            for start in range(0, n, batch):
+                items = [{"title": f"task {i}", "group_id": group_id} for i in range(start, min(n, start + batch))]
+                r = await c.post("/tasks/bulk/create", json=items, headers=headers)
+                ids.extend(item["id"] for item in r.json()["results"])
+
+        async def update_bulk():
+            for start in range(0, n, batch):
+                items = [{"id": task_id, "status": "done"} for task_id in ids[start:start + batch]]
+                await c.post("/tasks/bulk/update", json=items, headers=headers)
+
+        async def delete_bulk():
+            for start in range(0, n, batch):
+                await c.post("/tasks/bulk/delete", json={"ids": ids[start:start + batch]}, headers=headers)
+
+        results[f"bulk (batch {batch})"] = [await timed(create_bulk()), await timed(update_bulk()), await timed(delete_bulk())]
+
+    print(f"{n} tasks, tasks/s per phase")
+    print(f"  {'mode':<20}{'create':>10}{'update':>10}{'delete':>10}")
+    for name, timings in results.items():
+        print(f"  {name:<20}" + "".join(f"{n / t:>10.0f}" for t in timings))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.batch))
@@ -0,0 +1,94 @@
+# benchmarks/common.py
+import asyncio
+import inspect
+import os
+import re
+import statistics
+import tempfile
+import time
+
+# must happen before the app (and its settings) are imported
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+# load comes from a single client address: no rate limits
+os.environ.setdefault("RATE_LIMITS", "{}")
+
+import httpx
+
+from app.database import Base, engine
+from app.main import app
+
+
+def reset_db():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def client() -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+
+async def login(c: httpx.AsyncClient, email: str, password: str = "password", username: str = "bench") -> dict:
+    await c.post("/auth/register", json={"email": email, "username": username, "password": password})
+    r = await c.post("/auth/login", json={"email": email, "password": password})
+    r.raise_for_status()
+    return {"Authorization": "Bearer " + r.json()["access_token"]}
+
+
+QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def query_count(response: httpx.Response) -> int | None:
+    """SQL statements the request ran, from its Server-Timing header."""
+    match = QUERIES.search(response.headers.get("server-timing", ""))
+    return int(match.group(1)) if match else None
+
+
+async def run_load(make_request, requests: int, concurrency: int) -> dict:
+    """Fire ``requests`` calls of ``make_request()`` over ``concurrency`` workers.
+
+    ``make_request`` may take the call number (0..requests-1) as argument.
+    """
+    latencies, queries = [], []
+    remaining = iter(range(requests))
+    takes_index = bool(inspect.signature(make_request).parameters)
+
+    async def worker():
+        for i in remaining:
+            start = time.perf_counter()
+            r = await (make_request(i) if takes_index else make_request())
+            latencies.append(time.perf_counter() - start)
+            if r.status_code >= 400:
+                raise RuntimeError(f"{r.request.url} -> {r.status_code}: {r.text}")
+            count = query_count(r)
+            if count is not None:
+                queries.append(count)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, queries)
+
+
+def summarize(latencies: list[float], elapsed: float, queries: list[int] | None = None) -> dict:
+    ordered = sorted(latencies)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+    return {
+        "requests": len(ordered),
+        "rps": round(len(ordered) / elapsed, 1),
+        "p50_ms": round(pct(50), 2),
+        "p95_ms": round(pct(95), 2),
+        "p99_ms": round(pct(99), 2),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2) if ordered else 0.0,
+        "queries_per_request": round(statistics.fmean(queries), 2) if queries else None,
+    }
+
+
+def print_table(title: str, rows: dict[str, dict]):
+    print(title)
+    print(f"  {'scenario':<24}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'q/req':>8}")
+    for name, r in rows.items():
+        queries = r.get("queries_per_request")
+        print(f"  {name:<24}{r['rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{queries if queries is not None else '-':>8}")
@@ -0,0 +1,83 @@
+"""Server peak RSS while streaming /tasks/group/{id}/export for growing groups.
+
+The app runs in a separate uvicorn process (the in-process httpx transport
+buffers whole responses) and sizes run in increasing order, so a flat
+``peak MB`` column means the export does not hold the group in memory.
+
+    python -m benchmarks.export_memory [--sizes 1000 100000 ...] [--format ndjson|csv]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import httpx
+from sqlalchemy import insert
+
+from benchmarks.common import login, reset_db
+from app.database import engine
+from app.models import Group, Task
+
+
+def seed_group(name: str, size: int) -> int:
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        group_id = conn.execute(insert(Group).values(name=name)).inserted_primary_key[0]
+        for start in range(0, size, 10000):
+            conn.execute(insert(Task), [
+                {"title": f"task {i}", "description": "x" * 80, "status": "todo", "group_id": group_id, "created_at": now}
+                for i in range(start, min(size, start + 10000))
+            ])
+    return group_id
+
+
+def peak_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def main(sizes: list[int], fmt: str, port: int):
+    reset_db()
+    groups = {size: seed_group(f"export {size}", size) for size in sizes}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None) as c:
+            for _ in range(100):
+                try:
+                    await c.get("/docs")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            await export_all(c, groups, fmt, server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def export_all(c: httpx.AsyncClient, groups: dict[int, int], fmt: str, pid: int):
+    headers = await login(c, "bench@example.com")
+    print(f"  {'tasks':>10}{'MB sent':>10}{'seconds':>10}{'peak MB':>10}")
+    for size, group_id in groups.items():
+        start, sent = time.perf_counter(), 0
+        async with c.stream("GET", f"/tasks/group/{group_id}/export?format={fmt}", headers=headers) as r:
+            async for chunk in r.aiter_bytes():
+                sent += len(chunk)
+        print(f"  {size:>10}{sent / 2**20:>10.1f}{time.perf_counter() - start:>10.2f}{peak_rss_mb(pid):>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--format", default="ndjson", choices=["ndjson", "csv"])
+    parser.add_argument("--port", type=int, default=8911)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.format, args.port))
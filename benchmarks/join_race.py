@@ -0,0 +1,108 @@
+"""Concurrency check for group creation and invite joins.
+
+Fires concurrent requests at the flows that must stay consistent under
+races, then checks the database:
+
+* many users joining with one invite: exactly one gets in;
+* one user joining with several invites at once: one membership, and the
+  losing invites stay unused;
+* concurrent group creations: every group has exactly its admin member.
+
+    python -m benchmarks.join_race [--rounds N] [--concurrency C]
+
+Exits non-zero on any violation. Meaningful against a real Postgres
+(``DATABASE_URL``); on SQLite writes are serialized anyway.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from sqlalchemy import func, insert, select
+
+from benchmarks.common import client, reset_db
+from app.core.security import create_access_token, hash_password, user_claims
+from app.database import SessionLocal, engine
+from app.models import Group, GroupMember, Invite, User
+
+
+def seed_users(count: int) -> list[dict]:
+    """Users with ready-made tokens (no bcrypt per login)."""
+    hashed = hash_password("password")
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"race{i}@example.com", "username": f"race{i}", "hashed_password": hashed}
+            for i in range(count)
+        ])
+    with SessionLocal() as db:
+        users = db.scalars(select(User).order_by(User.id)).all()
+        return [{"Authorization": "Bearer " + create_access_token(user_claims(u))} for u in users]
+
+
+async def race(c, headers: list[dict], rounds: int, concurrency: int) -> list[str]:
+    errors = []
+    owner = headers[0]
+    for n in range(rounds):
+        group_id = (await c.post("/groups/", json={"name": f"race {n}"}, headers=owner)).json()["id"]
+
+        # many users, one invite
+        token = (await c.post(f"/groups/{group_id}/invite", headers=owner)).json()["token"]
+        joiners = headers[1:concurrency + 1]
+        responses = await asyncio.gather(*(c.get(f"/groups/join/{token}", headers=h) for h in joiners))
+        joined = sum(r.status_code == 200 for r in responses)
+        if joined != 1:
+            errors.append(f"round {n}: {joined} users joined with a single invite")
+
+        # one user, several invites
+        tokens = [
+            (await c.post(f"/groups/{group_id}/invite", headers=owner)).json()["token"]
+            for _ in range(concurrency)
+        ]
+        user = headers[concurrency + 1 + n % (len(headers) - concurrency - 1)]
+        await asyncio.gather(*(c.get(f"/groups/join/{t}", headers=user) for t in tokens))
+        with SessionLocal() as db:
+            used = db.scalar(select(func.count()).select_from(Invite).where(Invite.token.in_(tokens), Invite.used == True))
+        if used != 1:
+            errors.append(f"round {n}: one join used {used} invites")
+
+    # concurrent creations
+    responses = await asyncio.gather(*(
+        c.post("/groups/", json={"name": f"burst {i}"}, headers=headers[i % len(headers)])
+        for i in range(rounds * concurrency)
+    ))
+    created = [r.json()["id"] for r in responses if r.status_code == 200]
+    with SessionLocal() as db:
+        admins = dict(db.execute(
+            select(Group.id, func.count(GroupMember.id))
+            .outerjoin(GroupMember, GroupMember.group_id == Group.id)
+            .where(Group.id.in_(created))
+            .group_by(Group.id)
+        ).all())
+    for group_id in created:
+        if admins.get(group_id) != 1:
+            errors.append(f"group {group_id} created with {admins.get(group_id, 0)} members")
+    if len(created) != rounds * concurrency:
+        errors.append(f"{rounds * concurrency - len(created)} group creations failed")
+    return errors
+
+
+async def main(rounds: int, concurrency: int):
+    reset_db()
+    headers = seed_users(concurrency * 2 + 2)
+    start = time.perf_counter()
+    async with client() as c:
+        errors = await race(c, headers, rounds, concurrency)
+    print(f"{rounds} rounds x {concurrency} concurrent requests on {engine.dialect.name} in {time.perf_counter() - start:.1f}s")
+    for error in errors:
+        print("  FAIL", error)
+    if errors:
+        sys.exit(1)
+    print("  no violations")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.concurrency))
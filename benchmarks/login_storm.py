@@ -0,0 +1,83 @@
+"""Latency of a non-auth endpoint while a login storm is running.
+
+Compares bcrypt in the threadpool (``PASSWORD_HASH_WORKERS=0``, the old
+inline behaviour) with the dedicated hashing process pool.
+
+    python -m benchmarks.login_storm [--logins N] [--seconds S] [--workers W]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import client, login, reset_db, summarize
+from app.core.hashing import password_hasher
+from app.core.security import hash_password
+from app.database import SessionLocal
+from app.models import User
+
+
+def seed_users(count: int) -> list[str]:
+    hashed = hash_password("password")
+    emails = [f"storm{i}@example.com" for i in range(count)]
+    with SessionLocal() as db:
+        db.add_all(User(email=e, username="storm", hashed_password=hashed) for e in emails)
+        db.commit()
+    return emails
+
+
+async def scenario(c, headers, url, emails, concurrent_logins: int, seconds: float) -> dict:
+    deadline = time.perf_counter() + seconds
+    logins = {"ok": 0, "rejected": 0}
+    probe = []
+
+    async def storm(i):
+        while time.perf_counter() < deadline:
+            r = await c.post("/auth/login", json={"email": emails[i % len(emails)], "password": "password"})
+            logins["ok" if r.status_code == 200 else "rejected"] += 1
+
+    async def prober():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            r = await c.get(url, headers=headers)
+            r.raise_for_status()
+            probe.append(time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    await asyncio.gather(prober(), *(storm(i) for i in range(concurrent_logins)))
+    elapsed = time.perf_counter() - start
+    result = summarize(probe, elapsed)
+    result["logins_per_s"] = round(logins["ok"] / elapsed, 1)
+    result["logins_rejected"] = logins["rejected"]
+    return result
+
+
+async def main(concurrent_logins: int, seconds: float, workers: int):
+    reset_db()
+    emails = seed_users(concurrent_logins)
+    async with client() as c:
+        headers = await login(c, "probe@example.com")
+        group_id = (await c.post("/groups/", json={"name": "probe"}, headers=headers)).json()["id"]
+        url = f"/tasks/group/{group_id}?limit=10"
+
+        results = {"idle": await scenario(c, headers, url, emails, 0, seconds)}
+        for name, pool_size in (("threadpool bcrypt", 0), (f"process pool ({workers})", workers)):
+            password_hasher.shutdown()
+            password_hasher.workers = pool_size
+            await password_hasher.hash("warm-up")  # start the pool outside the measurement
+            results[name] = await scenario(c, headers, url, emails, concurrent_logins, seconds)
+        password_hasher.shutdown()
+
+    print(f"GET {url} during {concurrent_logins} concurrent login loops ({seconds}s each)")
+    print(f"  {'scenario':<24}{'p50 ms':>10}{'p99 ms':>10}{'logins/s':>10}{'429s':>8}")
+    for name, r in results.items():
+        print(f"  {name:<24}{r['p50_ms']:>10}{r['p99_ms']:>10}{r['logins_per_s']:>10}{r['logins_rejected']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=50, help="concurrent login loops")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=password_hasher.workers or 2)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.seconds, args.workers))
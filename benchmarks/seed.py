@@ -0,0 +1,102 @@
+# benchmarks/seed.py
+"""Deterministic dataset for the benchmark suite, written through the models'
+tables in large multi-row batches.
+
+Every user shares one password. User 1 ("bench0@example.com") is a member of
+the largest group, which also holds the largest share of the tasks.
+"""
+import random
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import insert, text
+
+from app.core import stats
+from app.core.security import hash_password
+from app.database import SessionLocal, engine
+from app.models import Group, GroupMember, Task, User
+
+PASSWORD = "password"
+STATUSES = ("todo", "in_progress", "done")
+BATCH = 10_000
+
+
+@dataclass(frozen=True)
+class Profile:
+    users: int
+    groups: int
+    members_per_group: int  # typical group; the first group gets ``big_group``
+    big_group: int
+    tasks: int
+
+
+PROFILES = {
+    "small": Profile(users=500, groups=50, members_per_group=20, big_group=500, tasks=20_000),
+    "medium": Profile(users=5_000, groups=200, members_per_group=50, big_group=5_000, tasks=250_000),
+    "large": Profile(users=10_000, groups=1_000, members_per_group=50, big_group=10_000, tasks=2_000_000),
+}
+
+
+def _insert(conn, table, rows):
+    for start in range(0, len(rows), BATCH):
+        conn.execute(insert(table), rows[start:start + BATCH])
+
+
+def seed(profile: Profile, rng_seed: int = 42) -> dict:
+    """Fill an empty schema; returns ids the scenarios need."""
+    rng = random.Random(rng_seed)
+    hashed = hash_password(PASSWORD)
+    now = datetime.utcnow()
+
+    with engine.begin() as conn:
+        _insert(conn, User.__table__, [
+            {"id": i, "email": f"bench{i - 1}@example.com", "username": f"user{i}", "hashed_password": hashed, "created_at": now}
+            for i in range(1, profile.users + 1)
+        ])
+        _insert(conn, Group.__table__, [
+            {"id": g, "name": f"group {g}", "owner_id": 1 if g == 1 else rng.randint(1, profile.users), "created_at": now, "version": 1}
+            for g in range(1, profile.groups + 1)
+        ])
+
+        memberships, members_of = [], {}
+        for g in range(1, profile.groups + 1):
+            size = min(profile.users, profile.big_group if g == 1 else profile.members_per_group)
+            members = range(1, size + 1) if g == 1 else sorted(rng.sample(range(1, profile.users + 1), size))
+            members_of[g] = list(members)
+            memberships.extend(
+                {"group_id": g, "user_id": u, "role": "admin" if u == members_of[g][0] else "member"}
+                for u in members
+            )
+        _insert(conn, GroupMember.__table__, memberships)
+
+        # a third of the tasks in the big group, the rest spread over the others
+        tasks = []
+        for n in range(profile.tasks):
+            g = 1 if n % 3 == 0 or profile.groups == 1 else rng.randint(2, profile.groups)
+            created = now - timedelta(minutes=profile.tasks - n)
+            tasks.append({
+                "title": f"task {n}",
+                "description": "",
+                "status": rng.choice(STATUSES),
+                # the API deals in dates: midnight deadlines
+                "deadline": datetime.combine(created.date() + timedelta(days=rng.randint(-30, 60)), time.min) if n % 2 else None,
+                "creator_id": rng.choice(members_of[g]),
+                "group_id": g,
+                "created_at": created,
+                "updated_at": created,
+            })
+            if len(tasks) == BATCH:
+                _insert(conn, Task.__table__, tasks)
+                tasks = []
+        _insert(conn, Task.__table__, tasks)
+
+        if conn.dialect.name == "postgresql":
+            # ids were given explicitly: move the sequences past them
+            for table in ("users", "groups"):
+                conn.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"))
+
+    with SessionLocal() as db:
+        stats.rebuild(db)
+        db.commit()
+
+    return {"user_email": "bench0@example.com", "group_id": 1, "users": profile.users}
@@ -0,0 +1,39 @@
+"""List endpoints with the FAST_JSON column-tuple path on and off.
+
+    python -m benchmarks.serialization [--requests N] [--concurrency C] [--limit L]
+"""
+import argparse
+import asyncio
+
+from benchmarks.common import client, print_table, reset_db, run_load
+from benchmarks.seed import PASSWORD, PROFILES, seed
+from app.core.config import settings
+
+
+async def main(requests: int, concurrency: int, limit: int):
+    reset_db()
+    seed(PROFILES["small"])
+    async with client() as c:
+        r = await c.post("/auth/login", json={"email": "bench0@example.com", "password": PASSWORD})
+        headers = {"Authorization": "Bearer " + r.json()["access_token"]}
+
+        endpoints = {
+            f"tasks (limit {limit})": f"/tasks/group/1?limit={limit}",
+            "users": "/users/",
+            "groups": "/groups/",
+        }
+        for name, url in endpoints.items():
+            results = {}
+            for label, fast in (("orm + validation", False), ("fast json", True)):
+                settings.FAST_JSON = fast
+                results[label] = await run_load(lambda: c.get(url, headers=headers), requests, concurrency)
+            print_table(f"GET {url} ({name})", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.limit))
@@ -0,0 +1,132 @@
+"""Cold start and per-process memory of the server.
+
+Three measurements, each in fresh processes:
+
+* ``import``: wall time and peak RSS of a bare ``import app.main``;
+* ``hash worker``: the same for a password hashing process, which only
+  imports app.core.passwords;
+* ``serve``: ``python -m app.cli serve`` with ``--workers`` processes, for
+  each available server: time until the first request is answered, then RSS
+  and PSS (RSS with shared pages split between the processes sharing them)
+  of every process of the tree.
+
+    python -m benchmarks.startup [--workers N] [--repeat R] [--port P]
+"""
+import argparse
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+IMPORT_PROBE = (
+    "import resource, time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+)
+
+
+def bench_env() -> dict:
+    env = os.environ.copy()
+    env.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "startup.db"))
+    env.setdefault("JOBS_ENABLED", "false")
+    return env
+
+
+def import_cost(module: str, repeat: int) -> tuple[float, float]:
+    """Median (seconds, peak RSS MB) of importing ``module`` in a fresh interpreter."""
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE.format(module=module)],
+            capture_output=True, text=True, check=True, env=bench_env(),
+        ).stdout.split()
+        runs.append((float(out[0]), int(out[1]) / 1024))
+    return statistics.median(r[0] for r in runs), statistics.median(r[1] for r in runs)
+
+
+def process_tree(root: int) -> list[int]:
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    tree, todo = [], [root]
+    while todo:
+        pid = todo.pop()
+        tree.append(pid)
+        todo.extend(children.get(pid, []))
+    return tree
+
+
+def memory_mb(pid: int) -> tuple[float, float]:
+    """(RSS, PSS) of ``pid`` in MB."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key] = int(rest.split()[0]) / 1024
+    return values.get("Rss", 0.0), values.get("Pss", 0.0)
+
+
+def serve_cost(server: str, workers: int, port: int) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "app.cli", "serve", "--server", server,
+         "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)],
+        env=bench_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if proc.poll() is not None or time.perf_counter() - start > 60:
+                    raise RuntimeError(f"{server} did not start")
+                time.sleep(0.05)
+        ready = time.perf_counter() - start
+        # let every worker finish booting before measuring
+        time.sleep(2)
+        processes = [(pid, *memory_mb(pid)) for pid in process_tree(proc.pid)]
+    finally:
+        proc.terminate()
+        proc.wait()
+    return {"ready_s": ready, "processes": processes}
+
+
+def main(workers: int, repeat: int, port: int):
+    print(f"  {'import':<28}{'seconds':>10}{'peak MB':>10}")
+    for label, module in (("app.main", "app.main"), ("hash worker", "app.core.passwords")):
+        seconds, rss = import_cost(module, repeat)
+        print(f"  {label:<28}{seconds:>10.3f}{rss:>10.1f}")
+
+    servers = ["uvicorn"] + (["gunicorn"] if importlib.util.find_spec("gunicorn") else [])
+    for server in servers:
+        result = serve_cost(server, workers, port)
+        processes = result["processes"]
+        print(f"\n  serve --server {server} --workers {workers}: first response after {result['ready_s']:.2f}s")
+        print(f"  {'pid':<28}{'RSS MB':>10}{'PSS MB':>10}")
+        for pid, rss, pss in processes:
+            print(f"  {pid:<28}{rss:>10.1f}{pss:>10.1f}")
+        print(f"  {'total':<28}{sum(p[1] for p in processes):>10.1f}{sum(p[2] for p in processes):>10.1f}")
+    if len(servers) == 1:
+        print("\n  (gunicorn is not installed: no preloaded-server numbers)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    main(args.workers, args.repeat, args.port)
@@ -0,0 +1,151 @@
+"""Reproducible API benchmark suite.
+
+Seeds a deterministic dataset (see ``benchmarks.seed``), drives the real ASGI
+app in-process with concurrent httpx clients and reports throughput,
+p50/p95/p99 latency and SQL statements per request (from the Server-Timing
+header) for each scenario. Results are saved as JSON to compare commits:
+
+    python -m benchmarks.suite run [--profile small|medium|large] [--output FILE]
+    python -m benchmarks.suite compare BASELINE.json CANDIDATE.json
+
+Uses a throwaway SQLite database unless ``DATABASE_URL`` points elsewhere,
+e.g. a local Postgres. ``--no-seed`` reuses an already seeded database.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from benchmarks.common import client, print_table, reset_db, run_load
+from benchmarks.seed import PASSWORD, PROFILES, seed
+from app.core.config import settings
+from app.database import SessionLocal, engine
+from app.models import Task
+
+METRICS = ("rps", "p50_ms", "p95_ms", "p99_ms", "queries_per_request")
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    profile = PROFILES[args.profile]
+    if not args.no_seed:
+        reset_db()
+        start = time.perf_counter()
+        seed(profile)
+        print(f"seeded profile {args.profile!r} in {time.perf_counter() - start:.1f}s")
+
+    group_id = 1
+    with SessionLocal() as db:
+        task_ids = db.scalars(select(Task.id).where(Task.group_id == group_id).limit(1000)).all()
+    rng = random.Random(7)
+    n, concurrency = args.requests, args.concurrency
+
+    async with client() as c:
+        r = await c.post("/auth/login", json={"email": "bench0@example.com", "password": PASSWORD})
+        r.raise_for_status()
+        headers = {"Authorization": "Bearer " + r.json()["access_token"]}
+
+        def login(i):
+            email = f"bench{i % profile.users}@example.com"
+            return c.post("/auth/login", json={"email": email, "password": PASSWORD})
+
+        def mutate(i):
+            if i % 2:
+                return c.post("/tasks/", json={"title": f"bench {i}", "group_id": group_id}, headers=headers)
+            return c.put(f"/tasks/{rng.choice(task_ids)}", json={"status": rng.choice(("todo", "done"))}, headers=headers)
+
+        scenarios = {
+            # bcrypt dominates: fewer requests
+            "login": (login, max(concurrency, n // 10)),
+            "group list": (lambda: c.get("/groups/", headers=headers), n),
+            "group detail (big)": (lambda: c.get(f"/groups/{group_id}", headers=headers), max(concurrency, n // 10)),
+            "task list": (lambda: c.get(f"/tasks/group/{group_id}?limit=50", headers=headers), n),
+            "task list (filtered)": (lambda: c.get(f"/tasks/group/{group_id}?limit=50&status=todo", headers=headers), n),
+            "task mutation": (mutate, n),
+            "user directory": (lambda: c.get("/users/?limit=20", headers=headers), n),
+            "user typeahead": (lambda i: c.get(f"/users/?q=user{i % 100}&limit=10", headers=headers), n),
+        }
+        results = {}
+        for name, (make_request, requests) in scenarios.items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = await run_load(make_request, requests, concurrency)
+
+    print_table(f"profile {args.profile}, {concurrency} clients", results)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "profile": args.profile,
+            "database": engine.dialect.name,
+            "db_mode": settings.DB_MODE,
+            "concurrency": concurrency,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline_path: str, candidate_path: str):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(candidate_path) as f:
+        candidate = json.load(f)
+    print(f"{baseline['meta'].get('commit')} -> {candidate['meta'].get('commit')}")
+    print(f"  {'scenario':<24}{'metric':<22}{'baseline':>10}{'candidate':>11}{'change':>9}")
+    for name, new in candidate["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        for metric in METRICS:
+            a, b = old.get(metric), new.get(metric)
+            if a is None or b is None:
+                continue
+            change = f"{(b - a) / a * 100:+.1f}%" if a else "-"
+            print(f"  {name:<24}{metric:<22}{a:>10}{b:>11}{change:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cmd = commands.add_parser("run", help="seed, run every scenario, save results")
+    cmd.add_argument("--profile", choices=PROFILES, default="small")
+    cmd.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    cmd.add_argument("--concurrency", type=int, default=16)
+    cmd.add_argument("--only", action="append", help="run only this scenario (repeatable)")
+    cmd.add_argument("--no-seed", action="store_true", help="reuse the data already in the database")
+    cmd.add_argument("--output", help="write results as JSON to this file")
+
+    cmd = commands.add_parser("compare", help="compare two result files")
+    cmd.add_argument("baseline")
+    cmd.add_argument("candidate")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        compare(args.baseline, args.candidate)
+        return
+
+    report = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -50,6 +50,10 @@ async function fetchGroup(id) {
     const res = await api("GET", `/groups/${id}`);
     return res ? res.json() : null;
 }
+async function fetchGroupDashboard(id) {
+    const res = await api("GET", `/groups/${id}/dashboard`);
+    return res ? res.json() : null;
+}
 async function fetchGroupMembers(id) {
     const res = await api("GET", `/groups/${id}/members`);
     return res ? res.json() : [];
@@ -67,10 +71,19 @@ async function joinGroupByToken(token) {
     return res ? res.json() : null;
 }
 
+// CHANGE FEED (Server-Sent Events; EventSource cannot send headers)
+function subscribeGroupEvents(groupId, onEvent) {
+    const token = localStorage.getItem("token");
+    const source = new EventSource(`${API_URL}/groups/${groupId}/events?token=${encodeURIComponent(token)}`);
+    source.onmessage = (e) => onEvent(JSON.parse(e.data));
+    return source;
+}
+
 // TASKS
-async function fetchGroupTasks(groupId) {
-    const res = await api("GET", `/tasks/group/${groupId}`);
-    return res ? res.json() : [];
+async function fetchGroupTasks(groupId, cursor = null) {
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+    const res = await api("GET", `/tasks/group/${groupId}${query}`);
+    return res ? res.json() : { items: [], next_cursor: null };
 }
 async function createTask(groupId, title, description = "", deadline = null, status = "todo") {
     const body = {
@@ -0,0 +1,89 @@
+# tests/test_join_race.py
+"""Concurrent invite joins must add one membership and use one invite.
+
+Only meaningful where transactions really run in parallel, so it needs a
+PostgreSQL database (tables are created if missing, existing rows are left
+alone)::
+
+    TEST_DATABASE_URL=postgresql+psycopg2://... python -m pytest tests
+"""
+import asyncio
+import os
+import uuid
+
+import pytest
+
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+if not DATABASE_URL.startswith("postgresql"):
+    pytest.skip("needs PostgreSQL (TEST_DATABASE_URL)", allow_module_level=True)
+
+# must happen before the app (and its settings) are imported
+os.environ["DATABASE_URL"] = DATABASE_URL
+os.environ["RATE_LIMITS"] = "{}"
+os.environ["JOBS_ENABLED"] = "false"
+
+import httpx
+from sqlalchemy import func, insert, select
+
+from app.core.security import create_access_token, user_claims
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app.models import GroupMember, Invite, User
+
+JOINS = 16
+
+
+def make_users(count: int) -> list[dict]:
+    """Auth headers of ``count`` new users."""
+    run = uuid.uuid4().hex[:8]
+    with engine.begin() as conn:
+        ids = conn.execute(insert(User).returning(User.id), [
+            {"email": f"race-{run}-{i}@example.com", "username": f"race{i}", "hashed_password": "x"}
+            for i in range(count)
+        ]).scalars().all()
+    with SessionLocal() as db:
+        users = db.scalars(select(User).where(User.id.in_(ids)).order_by(User.id)).all()
+        return [{"Authorization": "Bearer " + create_access_token(user_claims(u))} for u in users]
+
+
+def count(model, *where) -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(model).where(*where))
+
+
+async def race(check):
+    Base.metadata.create_all(engine)
+    headers = make_users(JOINS + 1)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        owner = headers[0]
+        group_id = (await c.post("/groups/", json={"name": "race"}, headers=owner)).json()["id"]
+        await check(c, group_id, owner, headers[1:])
+
+
+def test_many_users_one_invite():
+    async def check(c, group_id, owner, joiners):
+        token = (await c.post(f"/groups/{group_id}/invite", headers=owner)).json()["token"]
+        responses = await asyncio.gather(*(c.get(f"/groups/join/{token}", headers=h) for h in joiners))
+
+        assert sum(r.status_code == 200 for r in responses) == 1
+        assert count(GroupMember, GroupMember.group_id == group_id, GroupMember.role == "member") == 1
+        assert count(Invite, Invite.token == token, Invite.used == True) == 1
+
+    asyncio.run(race(check))
+
+
+def test_one_user_many_invites():
+    async def check(c, group_id, owner, joiners):
+        tokens = [
+            (await c.post(f"/groups/{group_id}/invite", headers=owner)).json()["token"]
+            for _ in range(JOINS)
+        ]
+        user = joiners[0]
+        responses = await asyncio.gather(*(c.get(f"/groups/join/{t}", headers=user) for t in tokens))
+
+        assert all(r.status_code == 200 for r in responses)
+        assert count(GroupMember, GroupMember.group_id == group_id, GroupMember.role == "member") == 1
+        # the joins that found the user already a member leave their invite unused
+        assert count(Invite, Invite.token.in_(tokens), Invite.used == True) == 1
+
+    asyncio.run(race(check))